@@ -0,0 +1,39 @@
+"""Command line interface of BACore, installed as the `bacore` command.
+
+The commands import their dependencies when they run, so that `bacore` starts with a base install and reports which
+extra to install for a command which needs one.
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command line interface, `bacore`."""
+    parser = argparse.ArgumentParser(prog="bacore", description="BACore command line interface.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_targets = commands.add_parser("export", help="Export content.").add_subparsers(dest="target", required=True)
+    export_documentation = export_targets.add_parser("documentation", help="Export the documentation as static site.")
+    export_documentation.add_argument("output_dir", type=Path, help="Directory to write the site to.")
+    export_documentation.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    export_documentation.add_argument("--force", action="store_true", help="Render all pages, also unchanged.")
+    args = parser.parse_args(argv)
+
+    try:
+        from bacore.web.export import export_site
+    except ModuleNotFoundError as e:
+        parser.exit(
+            status=1,
+            message=f"bacore export requires the web extra, install it with `pip install 'bacore[web]'` ({e}).\n",
+        )
+
+    exported_site = export_site(output_dir=args.output_dir, max_workers=args.workers, force=args.force)
+    print(
+        f"Exported {len(exported_site.pages_written)} pages to {exported_site.output_dir} "
+        f"({exported_site.pages_unchanged} unchanged, {len(exported_site.pages_removed)} removed)."
+    )
+
+
+if __name__ == "__main__":
+    main()
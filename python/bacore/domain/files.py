@@ -1,8 +1,17 @@
 """Module domain files for handling of files and directories."""
 
-import toml
+import copy
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import IO, ClassVar, Iterator, NamedTuple
+
+try:
+    import tomllib as toml
+    from tomllib import TOMLDecodeError
+except ModuleNotFoundError:
+    import toml
+    from toml import TomlDecodeError as TOMLDecodeError
 
 
 def ensure_path(path: str | Path) -> Path:
@@ -10,30 +19,201 @@ def ensure_path(path: str | Path) -> Path:
     return Path(path) if isinstance(path, str) else path
 
 
+class FileEntry(NamedTuple):
+    """File found when walking a directory, with the size and modification time from a single stat."""
+
+    path: Path
+    size: int
+    mtime: float
+
+
+class MarkdownHeading(NamedTuple):
+    """Heading in a markdown file, with the byte offset of the heading line."""
+
+    level: int
+    title: str
+    offset: int
+
+
 @dataclass
 class MarkdownFile:
-    """Markdown file representation."""
+    """Markdown file representation.
+
+    The file is read as a stream, and `iter_chunks` and `section` never hold more of the file in memory than they
+    return. Front matter is delimited by `---` for YAML or `+++` for TOML on the first line, and is read with
+    `front_matter`. It is skipped by `read` and `iter_chunks` when `skip_front_matter` is set, and never part of the
+    headings and sections. A first line delimiter without a closing delimiter within `front_matter_max_size`
+    characters is not front matter.
+    """
+
+    front_matter_formats: ClassVar[dict[str, str]] = {"---": "yaml", "+++": "toml"}
+    front_matter_max_size: ClassVar[int] = 2**16
 
     path: Path
     skip_title: bool
+    skip_front_matter: bool = False
 
     def __post_init__(self):
         self.path = ensure_path(self.path)
         if self.path.suffix not in [".md", ".markdown"]:
             raise ValueError("File should be in markdown format")
 
+    def _open(self) -> IO[str]:
+        try:
+            return self.path.open(encoding="utf-8")
+        except OSError as e:
+            raise OSError(f"Error reading file {self.path}: {e.strerror}") from e
+
+    def _read_front_matter(self, file: IO[str]) -> tuple[str, str] | None:
+        """Read the front matter format and text, leaving the file at the start of the body."""
+        delimiter = file.readline(self.front_matter_max_size).rstrip("\r\n")
+        fmt = self.front_matter_formats.get(delimiter)
+        if fmt is not None:
+            lines = []
+            size = 0
+            while size <= self.front_matter_max_size:
+                line = file.readline(self.front_matter_max_size + 1 - size)
+                if not line:
+                    break
+                if line.rstrip("\r\n") == delimiter:
+                    return fmt, "".join(lines)
+                lines.append(line)
+                size += len(line)
+        file.seek(0)
+        return None
+
+    def front_matter(self) -> dict:
+        """Front matter as dictionary, which is empty if the file has no front matter."""
+        with self._open() as file:
+            front_matter = self._read_front_matter(file)
+        if front_matter is None:
+            return {}
+        fmt, text = front_matter
+        if fmt == "toml":
+            try:
+                return toml.loads(text)
+            except TOMLDecodeError as e:
+                raise ValueError(f"Error decoding TOML front matter in {self.path}: {e}")
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError(
+                "PyYAML is required to read YAML front matter, install it with `pip install 'bacore[web]'`."
+            ) from e
+        try:
+            return yaml.safe_load(text) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Error decoding YAML front matter in {self.path}: {e}")
+
+    def iter_chunks(self, chunk_size: int = 2**16) -> Iterator[str]:
+        """Read the file in chunks of at most `chunk_size` characters and optionally skip the front matter and the title
+        line.
+
+        When the title is skipped, the whitespace following it is skipped as well.
+        """
+        with self._open() as file:
+            if self.skip_front_matter:
+                self._read_front_matter(file)
+            first_line = file.readline(chunk_size)
+            if self.skip_title and first_line.strip().startswith("#"):
+                while first_line and not first_line.endswith("\n"):
+                    first_line = file.readline(chunk_size)
+                chunk = file.read(chunk_size)
+                while chunk and not chunk.lstrip():
+                    chunk = file.read(chunk_size)
+                chunk = chunk.lstrip()
+            else:
+                chunk = first_line
+            while chunk:
+                yield chunk
+                chunk = file.read(chunk_size)
+
     def read(self) -> str:
-        """Read file and optionally strip the title line."""
+        """Read file and optionally strip the front matter and the title line."""
+        return "".join(self.iter_chunks())
+
+    @classmethod
+    def _body_offset(cls, file: IO[bytes]) -> int:
+        """Byte offset of the body, after the front matter, leaving the file at that offset."""
+        delimiter = file.readline(cls.front_matter_max_size).decode("utf-8", errors="replace").rstrip("\r\n")
+        if delimiter in cls.front_matter_formats:
+            size = 0
+            while size <= cls.front_matter_max_size:
+                line = file.readline(cls.front_matter_max_size + 1 - size)
+                if not line:
+                    break
+                if line.decode("utf-8", errors="replace").rstrip("\r\n") == delimiter:
+                    return file.tell()
+                size += len(line)
+        file.seek(0)
+        return 0
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _heading_index(path: Path, mtime_ns: int, size: int) -> tuple[MarkdownHeading, ...]:
+        """Index the headings of the body of a markdown file once per modification time and size.
+
+        Lines in the front matter and in fenced code blocks are not headings. As in CommonMark, a code block is closed
+        by a fence of the same character which is at least as long as the opening fence.
+        """
+        headings = []
+        fence = None
+        with path.open("rb") as file:
+            offset = MarkdownFile._body_offset(file)
+            for raw_line in file:
+                line = raw_line.decode("utf-8").rstrip("\r\n")
+                stripped = line.lstrip(" ")
+                indented = len(line) - len(stripped) > 3
+                if fence is not None:
+                    fence_char, fence_length = fence
+                    closing = stripped.rstrip()
+                    if not indented and len(closing) >= fence_length and closing == fence_char * len(closing):
+                        fence = None
+                elif not indented and stripped.startswith(("```", "~~~")):
+                    fence_char = stripped[0]
+                    fence_length = len(stripped) - len(stripped.lstrip(fence_char))
+                    if fence_char == "~" or "`" not in stripped[fence_length:]:
+                        fence = (fence_char, fence_length)
+                elif not indented and stripped.startswith("#"):
+                    line = stripped.strip()
+                    hashes = len(line) - len(line.lstrip("#"))
+                    title = line[hashes:]
+                    if hashes <= 6 and (title == "" or title[0] in " \t"):
+                        title = title.strip().rstrip("#").strip()
+                        headings.append(MarkdownHeading(level=hashes, title=title, offset=offset))
+                offset += len(raw_line)
+        return tuple(headings)
+
+    def headings(self) -> list[MarkdownHeading]:
+        """Headings of the file, in order."""
         try:
-            text = self.path.read_text()
+            stat = self.path.stat()
         except OSError as e:
             raise OSError(f"Error reading file {self.path}: {e.strerror}") from e
+        return list(self._heading_index(self.path.absolute(), stat.st_mtime_ns, stat.st_size))
+
+    def section(self, heading: str) -> str:
+        """Read a section, from its heading line up to the next heading of the same or a higher level.
+
+        Only the section is read from the file, at the offsets found in the cached heading index.
 
-        title, body = text.split("\n", 1)
-        if self.skip_title and title.strip().startswith("#"):
-            return body.lstrip()
+        Parameters:
+            heading: Title of the section heading, without the leading `#` characters.
+        """
+        headings = self.headings()
+        for position, section_heading in enumerate(headings):
+            if section_heading.title == heading:
+                break
         else:
-            return text
+            raise ValueError(f"Unable to find heading '{heading}' in {self.path}")
+        end = next(
+            (following.offset for following in headings[position + 1 :] if following.level <= section_heading.level),
+            None,
+        )
+        with self.path.open("rb") as file:
+            file.seek(section_heading.offset)
+            content = file.read() if end is None else file.read(end - section_heading.offset)
+        return content.decode("utf-8")
 
 
 @dataclass
@@ -48,10 +228,24 @@ class TOMLFile:
         if self.path.suffix != ".toml":
             raise ValueError("File should be in TOML format")
 
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _parse(path: Path, mtime_ns: int, size: int) -> dict:
+        """Parse a TOML file once per modification time and size.
+
+        The cache is shared by all `TOMLFile` instances in the process, and an edited file gets a new cache key.
+        """
+        return toml.loads(path.read_text())
+
     def data_to_dict(self) -> dict:
-        """Content as dictionary."""
+        """Content as dictionary.
+
+        The parsed content is cached, so that repeated reads of an unchanged file only cost a stat. Each call returns
+        its own copy of the content, which is safe to modify.
+        """
+        stat = self.path.stat()
         try:
-            content = toml.loads(self.path.read_text())
-        except toml.TomlDecodeError as e:
+            content = self._parse(self.path.absolute(), stat.st_mtime_ns, stat.st_size)
+        except TOMLDecodeError as e:
             raise ValueError(f"Error decoding TOML file {self.path}: {e}")
-        return content
+        return copy.deepcopy(content)
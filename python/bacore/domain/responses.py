@@ -1,6 +1,8 @@
 """Response models."""
+from datetime import datetime
 from pathlib import Path
 from pydantic import BaseModel
+from typing import Optional
 
 
 class DeletedFilesR(BaseModel):
@@ -11,4 +13,106 @@ class DeletedFilesR(BaseModel):
     older_than_days: int
     recursive: bool
     number_of_deleted_files: int
-    deleted_files: list[Path]
\ No newline at end of file
+    deleted_files: list[Path]
+    bytes_freed: int = 0
+    deleted_files_truncated: bool = False
+    started_at: Optional[datetime] = None
+    elapsed_seconds: float = 0.0
+    files_per_second: float = 0.0
+    mb_per_second: float = 0.0
+
+
+class DirectoryDeletionR(BaseModel):
+    """Files planned for deletion in a directory."""
+
+    number_of_files: int = 0
+    total_bytes: int = 0
+
+
+class DeletionPlanR(BaseModel):
+    """Summary of files which would be deleted, without deleting them."""
+
+    path: Path
+    pattern: str
+    older_than_days: int
+    recursive: bool
+    number_of_files: int
+    total_bytes: int
+    oldest_modified: Optional[datetime]
+    newest_modified: Optional[datetime]
+    directories: dict[Path, DirectoryDeletionR]
+
+
+class ExportedSiteR(BaseModel):
+    """Exported static site summary."""
+
+    output_dir: Path
+    pages_written: list[str]
+    pages_unchanged: int
+    pages_removed: list[str]
+
+
+class MirroredFilesR(BaseModel):
+    """Mirrored files summary."""
+
+    source: Path
+    destination: Path
+    pattern: str
+    files_copied: int
+    files_deleted: int
+    files_skipped: int
+    bytes_transferred: int
+    started_at: Optional[datetime] = None
+    elapsed_seconds: float = 0.0
+    mb_per_second: float = 0.0
+
+
+class DuplicateFilesGroupR(BaseModel):
+    """Files with identical content."""
+
+    digest: str
+    size: int
+    files: list[Path]
+
+
+class DuplicateFilesR(BaseModel):
+    """Duplicate files summary."""
+
+    path: Path
+    pattern: str
+    recursive: bool
+    number_of_files: int
+    number_of_files_hashed: int
+    duplicate_groups: list[DuplicateFilesGroupR]
+    wasted_bytes: int
+    elapsed_seconds: float = 0.0
+
+
+class WrittenTestDataR(BaseModel):
+    """Test data written to file summary."""
+
+    path: Path
+    file_format: str
+    fields: list[str]
+    number_of_rows: int
+    elapsed_seconds: float = 0.0
+
+
+class PresentationBuildR(BaseModel):
+    """Presentation built in a batch, or the error which stopped it from being built."""
+
+    presentation_id: int
+    name: Optional[str] = None
+    path: Optional[Path] = None
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class PresentationBatchR(BaseModel):
+    """Batch of built presentations summary."""
+
+    output_dir: Path
+    presentations: list[PresentationBuildR]
+    number_of_built: int
+    number_of_failed: int
+    elapsed_seconds: float = 0.0
@@ -2,8 +2,9 @@
 
 import platform
 from bacore.domain.files import TOMLFile
+from bacore.domain.protocols import SupportsRetrieveDict
 from pathlib import Path
-from pydantic import BaseModel, Field, computed_field, field_validator, SecretStr
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, field_validator, SecretStr
 from pydantic_settings import BaseSettings
 from typing import Optional, cast
 
@@ -11,6 +12,8 @@ from typing import Optional, cast
 class Project(BaseModel):
     """Project information."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     version: Optional[str] = None
     description: Optional[str] = None
@@ -69,9 +72,24 @@ class Credentials(BaseSettings):
 
 
 class ProjectSettings(BaseSettings):
-    """Project settings assumes that the project will use a pyproject.toml file."""
+    """Project settings assumes that the project will use a pyproject.toml file.
+
+    The project information is read once into an immutable `Project` snapshot, which is shared by all properties.
+    Call `reload()` to read it again, or set `auto_reload` to read it again whenever the source file has changed.
+
+    Parameters:
+        source: Read the project information from this source instead of the pyproject.toml file in `path`.
+    """
 
     path: Path = Field(default=Path("."), alias="project_root_dir")
+    auto_reload: bool = False
+    _source: Optional[SupportsRetrieveDict] = PrivateAttr(default=None)
+    _snapshot: Optional[Project] = PrivateAttr(default=None)
+    _snapshot_fingerprint: Optional[tuple[int, int]] = PrivateAttr(default=None)
+
+    def __init__(self, source: Optional[SupportsRetrieveDict] = None, **data):
+        super().__init__(**data)
+        self._source = source
 
     @field_validator("path")
     @classmethod
@@ -89,22 +107,48 @@ class ProjectSettings(BaseSettings):
             raise FileNotFoundError(f"Unable to find pyproject.toml file, got '{project_file}'")
         return project_file
 
+    @property
+    def _project_source(self) -> SupportsRetrieveDict:
+        """Source of the project information."""
+        return self._source if self._source is not None else TOMLFile(path=self._pyproject_file)
+
+    @staticmethod
+    def _fingerprint(source: SupportsRetrieveDict) -> Optional[tuple[int, int]]:
+        """Modification time and size of the file behind the source, if the source has a path."""
+        source_path = getattr(source, "path", None)
+        if source_path is None:
+            return None
+        stat = Path(source_path).stat()
+        return stat.st_mtime_ns, stat.st_size
+
     @computed_field
     @property
     def _project_info_as_dict(self) -> dict:
         """pyproject.toml file as dictionary."""
-        return TOMLFile(path=self._pyproject_file).data_to_dict()
+        return self._project_source.data_to_dict()
+
+    def reload(self) -> Project:
+        """Read the project information from the source and replace the snapshot."""
+        source = self._project_source
+        fingerprint = self._fingerprint(source)
+        project_info = source.data_to_dict()["project"]
+        self._snapshot = Project(
+            name=project_info["name"],
+            version=project_info.get("version"),
+            description=project_info.get("description"),
+        )
+        self._snapshot_fingerprint = fingerprint
+        return self._snapshot
 
     @computed_field
     @property
     def _project_info(self) -> Project:
         """Project information."""
-        info = Project(
-            name=self._project_info_as_dict["project"]["name"],
-            version=self._project_info_as_dict["project"]["version"],
-            description=self._project_info_as_dict["project"]["description"],
-        )
-        return info
+        if self._snapshot is None:
+            return self.reload()
+        if self.auto_reload and self._fingerprint(self._project_source) != self._snapshot_fingerprint:
+            return self.reload()
+        return self._snapshot
 
     @property
     def name(self) -> str:
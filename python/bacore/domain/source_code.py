@@ -1,11 +1,22 @@
 """Source code entities."""
 
+import ast
 import inspect
+import json
+import os
+import threading
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
-from pydantic import BaseModel, computed_field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, computed_field, field_validator
 from types import ModuleType
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional, Sequence
+
+CLASS_MEMBER_CACHE_SIZE = 1024
+"""Number of classes whose members are kept by `ClassModel`. The cache is created with this size on import, so it is
+fixed for the lifetime of the process."""
 
 
 class FunctionModel(BaseModel):
@@ -42,32 +53,254 @@ class ClassModel(BaseModel):
     def doc(self) -> str | None:
         return inspect.getdoc(self.klass)
 
-    def functions(self) -> list[FunctionModel]:
-        """Get functions as members from module and type as 'SrcFunc' class."""
-        return [
+    @staticmethod
+    @lru_cache(maxsize=CLASS_MEMBER_CACHE_SIZE)
+    def _members(klass: type) -> tuple[tuple[FunctionModel, ...], tuple["ClassModel", ...]]:
+        """Functions and classes which are members of a class, and belong to the module of the class.
+
+        Members are collected once per class object and kept in a process wide cache, which is bounded to the
+        `CLASS_MEMBER_CACHE_SIZE` most recently used classes.
+        """
+        members = inspect.getmembers(klass)
+        functions = tuple(
             FunctionModel(func=member)
-            for _, member in inspect.getmembers(self.klass)
+            for _, member in members
             if (inspect.isfunction(member) or inspect.ismethod(member) or hasattr(member, "__wrapped__"))
-            and member.__module__.startswith(self.klass.__module__)
-        ]
+            and member.__module__.startswith(klass.__module__)
+        )
+        classes = tuple(
+            ClassModel(klass=member)
+            for _, member in members
+            if inspect.isclass(member) and member.__module__.startswith(klass.__module__)
+        )
+        return functions, classes
+
+    def functions(self) -> list[FunctionModel]:
+        """Get functions as members from module and type as 'SrcFunc' class."""
+        return list(self._members(self.klass)[0])
 
     def classes(self) -> list["ClassModel"]:
         """Get classes as members from module and type as 'SrcClass' class.
 
         **Todo:** Recreate this function as recursive.
         """
-        return [
-            ClassModel(klass=member)
-            for _, member in inspect.getmembers(self.klass)
-            if inspect.isclass(member) and member.__module__.startswith(self.klass.__module__)
+        return list(self._members(self.klass)[1])
+
+
+class StaticFunctionModel(BaseModel):
+    """Python function model read from the source code, without importing it."""
+
+    func_name: str
+    docstring: Optional[str] = None
+
+    @computed_field
+    @property
+    def name(self) -> str:
+        """Function name."""
+        return self.func_name.replace("_", " ")
+
+    @computed_field
+    @property
+    def doc(self) -> str | None:
+        """Function docstring."""
+        return self.docstring
+
+
+class StaticClassModel(BaseModel):
+    """Python class model read from the source code, without importing it."""
+
+    class_name: str
+    docstring: Optional[str] = None
+    function_members: list[StaticFunctionModel] = []
+    class_members: list["StaticClassModel"] = []
+
+    @computed_field
+    @property
+    def name(self) -> str:
+        """Name of class without underscores."""
+        return self.class_name.replace("_", " ")
+
+    @computed_field
+    @property
+    def doc(self) -> str | None:
+        return self.docstring
+
+    def functions(self) -> list[StaticFunctionModel]:
+        """Functions defined in the class body."""
+        return self.function_members
+
+    def classes(self) -> list["StaticClassModel"]:
+        """Classes defined in the class body."""
+        return self.class_members
+
+
+class ModuleSummary(BaseModel):
+    """Docstrings and members of a module, as found in the source file with the given modification time and size."""
+
+    mtime_ns: int
+    size: int
+    doc: Optional[str] = None
+    functions: list[StaticFunctionModel] = []
+    classes: list[StaticClassModel] = []
+
+
+class SourceIndex:
+    """Index of module docstrings and members, made with static analysis instead of importing the modules.
+
+    A file is only parsed again when its modification time or size has changed. With an `index_file` is the index
+    loaded from disk when created and written back with `save()`, which makes rebuilding documentation for a large
+    source tree only parse the files which have changed since the last build.
+
+    Parameters:
+        `index_file`: Optional JSON file where the index is persisted.
+
+    Examples:
+        >>> index = SourceIndex()
+        >>> index.summary(Path("python/bacore/domain/errors.py")).doc
+        'Module for handling exceptions.'
+    """
+
+    format_version = 1
+    property_decorators = {"property", "cached_property", "computed_field", "setter", "getter", "deleter"}
+
+    def __init__(self, index_file: Optional[Path] = None):
+        self.index_file = index_file
+        self._entries: dict[str, ModuleSummary] = {}
+        self._changed = False
+        self._lock = threading.Lock()
+        if index_file is not None and index_file.is_file():
+            self._load(index_file)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, index_file: Path) -> None:
+        """Load entries from disk. An unreadable or outdated index is ignored and rebuilt on use."""
+        try:
+            content = json.loads(index_file.read_text(encoding="utf-8"))
+            if content.get("version") != self.format_version:
+                return
+            self._entries = {path: ModuleSummary.model_validate(entry) for path, entry in content["modules"].items()}
+        except (OSError, ValueError, KeyError, AttributeError, ValidationError):
+            self._entries = {}
+
+    @staticmethod
+    def _decorator_name(decorator: ast.expr) -> str:
+        if isinstance(decorator, ast.Call):
+            decorator = decorator.func
+        if isinstance(decorator, ast.Attribute):
+            return decorator.attr
+        if isinstance(decorator, ast.Name):
+            return decorator.id
+        return ""
+
+    @classmethod
+    def _static_functions(cls, body: list[ast.stmt], skip_properties: bool) -> list[StaticFunctionModel]:
+        functions = [
+            StaticFunctionModel(func_name=node.name, docstring=ast.get_docstring(node))
+            for node in body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and not (
+                skip_properties and {cls._decorator_name(d) for d in node.decorator_list} & cls.property_decorators
+            )
         ]
+        return sorted(functions, key=lambda function: function.func_name)
+
+    @classmethod
+    def _static_classes(cls, body: list[ast.stmt]) -> list[StaticClassModel]:
+        classes = [
+            StaticClassModel(
+                class_name=node.name,
+                docstring=ast.get_docstring(node),
+                function_members=cls._static_functions(node.body, skip_properties=True),
+                class_members=cls._static_classes(node.body),
+            )
+            for node in body
+            if isinstance(node, ast.ClassDef)
+        ]
+        return sorted(classes, key=lambda klass: klass.class_name)
+
+    @classmethod
+    def parse(cls, path: Path) -> ModuleSummary:
+        """Parse a Python source file with `ast` and summarize its docstrings and members.
+
+        Functions and classes are ordered by name, in the same way as `inspect.getmembers` orders them.
+
+        Raises:
+            ValueError: If the source file can not be parsed.
+        """
+        stat = path.stat()
+        try:
+            tree = ast.parse(path.read_bytes(), filename=str(path))
+        except SyntaxError as e:
+            raise ValueError(f"Unable to parse {path}: {e.msg} (line {e.lineno})") from e
+
+        return ModuleSummary(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            doc=ast.get_docstring(tree),
+            functions=cls._static_functions(tree.body, skip_properties=False),
+            classes=cls._static_classes(tree.body),
+        )
+
+    def summary(self, path: Path) -> ModuleSummary:
+        """Summary of module, parsed again only if the file has changed since it was indexed."""
+        key = str(path.resolve())
+        stat = path.stat()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+
+        entry = self.parse(path)
+        with self._lock:
+            self._entries[key] = entry
+            self._changed = True
+        return entry
+
+    def prune(self) -> int:
+        """Remove entries for files which no longer exist and return the number of removed entries."""
+        with self._lock:
+            removed = [path for path in self._entries if not Path(path).is_file()]
+            for path in removed:
+                del self._entries[path]
+            self._changed = self._changed or bool(removed)
+        return len(removed)
+
+    def save(self) -> None:
+        """Write the index to `index_file`, if anything has changed since it was loaded.
+
+        The file is first written to a temporary file and then moved into place, so that a reader never sees a
+        partially written index.
+        """
+        if self.index_file is None:
+            raise ValueError("No index file given, unable to save source index.")
+        with self._lock:
+            if not self._changed and self.index_file.is_file():
+                return
+            content = {
+                "version": self.format_version,
+                "modules": {path: entry.model_dump() for path, entry in self._entries.items()},
+            }
+            self._changed = False
+
+        tmp_file = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(content), encoding="utf-8")
+        os.replace(tmp_file, self.index_file)
 
 
 class ModuleModel(BaseModel):
-    """Python source file."""
+    """Python source file.
+
+    With an `index` given are docstrings and members read from the source code with static analysis, instead of
+    importing the module. That avoids executing code on module level and is much faster for repeated access.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     path: Path
     package_root: Optional[str] = None
+    index: Optional[SourceIndex] = Field(default=None, exclude=True)
 
     def __lt__(self, other: "ModuleModel") -> bool:
         """Defining ordering by module name."""
@@ -108,10 +341,14 @@ class ModuleModel(BaseModel):
 
     @property
     def doc(self) -> str | None:
+        if self.index is not None:
+            return self.index.summary(self.path).doc
         return self._as_module().__doc__
 
-    def functions(self) -> list[FunctionModel]:
+    def functions(self) -> list[FunctionModel] | list[StaticFunctionModel]:
         """Class members of source file."""
+        if self.index is not None:
+            return self.index.summary(self.path).functions
         return [
             FunctionModel(func=member)
             for _, member in inspect.getmembers(self._as_module())
@@ -119,8 +356,10 @@ class ModuleModel(BaseModel):
             and member.__module__.startswith(self.uri)
         ]
 
-    def classes(self) -> list[ClassModel]:
+    def classes(self) -> list[ClassModel] | list[StaticClassModel]:
         """Get the members of a module which belong to the file."""
+        if self.index is not None:
+            return self.index.summary(self.path).classes
         return [
             ClassModel(klass=member)
             for _, member in inspect.getmembers(self._as_module())
@@ -128,11 +367,30 @@ class ModuleModel(BaseModel):
         ]
 
 
+@dataclass(frozen=True)
+class ModuleEntry:
+    """Lightweight reference to a module found when traversing a directory, see `DirectoryModel.iter_modules`."""
+
+    path: Path
+    package_root: Optional[str] = None
+    index: Optional[SourceIndex] = None
+
+    def model(self) -> ModuleModel:
+        """Module model for the entry."""
+        return ModuleModel(path=self.path, package_root=self.package_root, index=self.index)
+
+
 class DirectoryModel(BaseModel):
-    """Source directory."""
+    """Source directory.
+
+    An `index` is passed on to all modules and subdirectories, see `ModuleModel`.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     path: Path
     package_root: Optional[str] = None
+    index: Optional[SourceIndex] = Field(default=None, exclude=True)
 
     def __lt__(self, other: "DirectoryModel"):
         return self.path < other.path
@@ -146,7 +404,7 @@ class DirectoryModel(BaseModel):
     @property
     def modules(self) -> list[ModuleModel]:
         module_list = [
-            ModuleModel(path=dir_path, package_root=self.package_root)
+            ModuleModel(path=dir_path, package_root=self.package_root, index=self.index)
             for dir_path in self.path.glob("*.py")
             if dir_path.is_file()
         ]
@@ -156,8 +414,54 @@ class DirectoryModel(BaseModel):
     @property
     def directories(self) -> list["DirectoryModel"]:
         directory_list = [
-            DirectoryModel(path=dir_path, package_root=self.package_root)
+            DirectoryModel(path=dir_path, package_root=self.package_root, index=self.index)
             for dir_path in self.path.glob("*")
-            if dir_path.is_dir() and not (dir_path.name.startswith("__") or dir_path.name.startswith(".mypy_cache"))
+            if dir_path.is_dir() and self._is_package_directory(dir_path.name)
         ]
         return sorted(directory_list)
+
+    @staticmethod
+    def _is_package_directory(name: str) -> bool:
+        return not (name.startswith("__") or name.startswith(".mypy_cache"))
+
+    def iter_modules(
+        self,
+        recursive: bool = True,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+    ) -> Iterator[ModuleEntry]:
+        """Traverse the directory lazily and yield an entry for each module.
+
+        Unlike `modules` and `directories` is no model built for the tree. Directories are read one at a time with
+        `os.scandir`, modules of a directory are yielded before its subdirectories, and both in name order.
+
+        Parameters:
+            recursive: Whether to traverse subdirectories.
+            include: Only yield modules with a path, relative to the directory, matching any of these glob patterns.
+            exclude: Skip modules and subdirectories with a path, relative to the directory, matching any of these
+                glob patterns.
+        """
+
+        def matches(relative_path: str, patterns: Optional[Sequence[str]]) -> bool:
+            return patterns is not None and any(fnmatch(relative_path, pattern) for pattern in patterns)
+
+        directories = [self.path]
+        while directories:
+            directory = directories.pop()
+            try:
+                with os.scandir(directory) as scandir_entries:
+                    entries = sorted(scandir_entries, key=lambda entry: entry.name)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                relative_path = Path(entry.path).relative_to(self.path).as_posix()
+                if entry.is_dir():
+                    if recursive and self._is_package_directory(entry.name) and not matches(relative_path, exclude):
+                        subdirectories.append(Path(entry.path))
+                elif entry.name.endswith(".py") and entry.is_file():
+                    if (include is None or matches(relative_path, include)) and not matches(relative_path, exclude):
+                        yield ModuleEntry(path=Path(entry.path), package_root=self.package_root, index=self.index)
+
+            directories.extend(reversed(subdirectories))
@@ -1,9 +1,17 @@
 """Test data generation."""
 
+import json
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from faker import Faker
 from hypothesis import strategies as st
-from typing import Optional
+from typing import ClassVar, Iterator, Optional, Sequence
 
 
 @dataclass(frozen=True)
@@ -82,6 +90,116 @@ class CountryCodes:
             return getattr(cls, name)
 
 
+def _luhn_value(digit: int, doubled: bool) -> int:
+    """Value of a digit in the Luhn sum."""
+    value = digit * 2 if doubled else digit
+    return value - 9 if value > 9 else value
+
+
+class ISINGenerator:
+    """International Securities Identification Numbers (ISIN) with valid check digits.
+
+    An ISIN is a country code, a nine character national security identifier and a check digit, which is calculated
+    with the Luhn algorithm on the code with letters converted to numbers (`A` is 10, `B` is 11, ...). Generated codes
+    have numeric national identifiers, for which the check digit is summed from tables of three digit chunks instead
+    of digit by digit.
+
+    Parameters:
+        `countries`: ISO 3166 country codes, such as `SE`, or locales from `CountryCodes`, such as `sv_SE`.
+
+    Examples:
+        >>> ISINGenerator.check_digit("US037833100")
+        '5'
+
+        >>> ISINGenerator(["sv_SE"]).from_number("SE", 10865)
+        'SE0000108656'
+    """
+
+    # Luhn sums of three digit chunks, for chunks where the first digit is doubled and where it is not.
+    _chunk_sums: ClassVar[dict[bool, list[int]]] = {
+        first_doubled: [
+            sum(
+                _luhn_value(int(digit), doubled=(position % 2 == 0) == first_doubled)
+                for position, digit in enumerate(f"{chunk:03}")
+            )
+            for chunk in range(1000)
+        ]
+        for first_doubled in (True, False)
+    }
+
+    def __init__(self, countries: Sequence[str]):
+        self.countries = [country[-2:].upper() for country in countries]
+        if not self.countries:
+            raise ValueError("At least one country is needed to generate ISIN codes.")
+        self._country_sums = {country: self._luhn_sum(self._digits(country), offset=9) for country in self.countries}
+
+    @staticmethod
+    def _digits(code: str) -> str:
+        """Code with letters converted to numbers."""
+        return "".join(str(int(character, 36)) for character in code)
+
+    @staticmethod
+    def _luhn_sum(digits: str, offset: int = 0) -> int:
+        """Luhn sum of digits, which are followed by `offset` digits and the check digit."""
+        return sum(
+            _luhn_value(int(digit), doubled=(len(digits) - position + offset) % 2 == 1)
+            for position, digit in enumerate(digits)
+        )
+
+    @classmethod
+    def check_digit(cls, code: str) -> str:
+        """Check digit for the first eleven characters of an ISIN."""
+        return str(-cls._luhn_sum(cls._digits(code.upper())) % 10)
+
+    @classmethod
+    def is_valid(cls, isin: str) -> bool:
+        """Whether the ISIN has a country code, a national identifier and a valid check digit."""
+        return (
+            len(isin) == 12
+            and isin[:2].isalpha()
+            and isin[2:11].isalnum()
+            and isin[11].isdigit()
+            and cls.check_digit(isin[:11]) == isin[11]
+        )
+
+    def from_number(self, country: str, number: int) -> str:
+        """ISIN for a country with the number, from `0` to `999_999_999`, as national identifier."""
+        chunk_sums = self._chunk_sums
+        high, low = divmod(number, 1000)
+        high, middle = divmod(high, 1000)
+        luhn_sum = (
+            self._country_sums[country] + chunk_sums[True][high] + chunk_sums[False][middle] + chunk_sums[True][low]
+        )
+        return f"{country}{number:09}{-luhn_sum % 10}"
+
+    def generate(self, n: int, rng: Optional[random.Random] = None) -> list[str]:
+        """Generate `n` random ISIN codes, for countries picked at random.
+
+        Parameters:
+            `n`: Number of codes.
+            `rng`: Random number generator, for reproducible codes.
+        """
+        rng = rng or random.Random()
+        country_sums = self._country_sums
+        doubled_first, single_first = self._chunk_sums[True], self._chunk_sums[False]
+        codes = []
+        for country, unit in zip(rng.choices(self.countries, k=n), [rng.random() for _ in range(n)]):
+            number = int(unit * 1_000_000_000)
+            high, low = divmod(number, 1000)
+            high, middle = divmod(high, 1000)
+            luhn_sum = country_sums[country] + doubled_first[high] + single_first[middle] + doubled_first[low]
+            codes.append(f"{country}{number:09}{-luhn_sum % 10}")
+        return codes
+
+    def strategy(self) -> st.SearchStrategy:
+        """Hypothesis strategy for ISIN codes, built from a country and an integer, which shrinks towards `0`."""
+        return st.builds(
+            self.from_number,
+            st.sampled_from(self.countries),
+            st.integers(min_value=0, max_value=999_999_999),
+        )
+
+
 @dataclass
 class PytestRunData:
     """Test result."""
@@ -114,13 +232,41 @@ class FakerData(Faker):
 
     Methods:
         `seed()`: Seed the random number generator for reproducibility.
+        `shared()`: Instance shared by the whole process, which is only created once per locales and weighting.
+        `reseed_shared()`: Seed all shared instances.
     """
 
+    _shared_instances: ClassVar[dict[tuple[tuple[str, ...], bool], "FakerData"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, country_or_region: str, match_real_world_occurrences: bool = False):
         country_codes = CountryCodes.for_locale(country_or_region)
         self.match_real_world_occurrences = match_real_world_occurrences
         super().__init__(country_codes, use_weighting=self.match_real_world_occurrences)
 
+    @classmethod
+    def shared(cls, country_or_region: str, match_real_world_occurrences: bool = False) -> "FakerData":
+        """Instance shared by the whole process, keyed by the locales of the country or region and the weighting.
+
+        Creating a `Faker` loads the providers of all its locales, which is slow for regions with many countries.
+        Shared instances pay that cost once, but also share their random state: seed them with `seed_instance()` or
+        `reseed_shared()` where reproducibility matters, and do not use them from more than one thread at a time.
+        """
+        country_codes = CountryCodes.for_locale(country_or_region)
+        locales = (country_codes,) if isinstance(country_codes, str) else tuple(country_codes)
+        key = (locales, match_real_world_occurrences)
+        with cls._shared_lock:
+            if key not in cls._shared_instances:
+                cls._shared_instances[key] = cls(country_or_region, match_real_world_occurrences)
+            return cls._shared_instances[key]
+
+    @classmethod
+    def reseed_shared(cls, seed: Optional[int] = None) -> None:
+        """Seed all shared instances, where `None` reseeds them from system randomness."""
+        with cls._shared_lock:
+            for faker_data in cls._shared_instances.values():
+                faker_data.seed_instance(seed)
+
 
 class TestData:
     """Test data strategies for hypothesis.
@@ -129,19 +275,213 @@ class TestData:
         `country_or_region`: A country or region for which test data is generated.
         `match_real_world_occurrences`: Makes `Faker` try to match the real world occurrences of the data. Default is
             `False` and if `True` will data generation be slower.
+        `shared_faker`: Use the `FakerData.shared()` instance for the locale, which is only created once per process.
+            Default is `True`. Seeding, with `reseed()` or a `seed` for pools and generation, replaces the shared
+            instance with one of its own first, so that the seed does not change the values of other test data.
+        `strategy_pool_size`: Back the hypothesis strategies with `st.sampled_from` over a pool of this many values
+            per field, instead of calling `Faker` for every example. Examples then shrink towards the first values of
+            the pool. Default is `None`, which calls `Faker`.
+        `strategy_pool_seed`: Seed of the pools behind the hypothesis strategies. Default is `0`.
+        `pool_dir`: Directory where seeded pools are saved, per locale, field, size and seed, and loaded from by
+            later test runs. Default is `None`, which keeps pools in memory only.
 
     Examples:
         >>> company_st = TestData(country_or_region="sweden").company_st()
         >>> isinstance(company_st, st.SearchStrategy)
         True
+
+        >>> rows = TestData(country_or_region="sweden").generate(3, fields=["first_name", "last_name"], seed=1)
+        >>> [len(column) for column in rows.values()]
+        [3, 3]
     """
 
-    def __init__(self, country_or_region: str, match_real_world_occurrences: bool = False):
+    fields: ClassVar[tuple[str, ...]] = ("company", "currency_code", "first_name", "isin", "last_name", "ssn")
+    _seeded_pools: ClassVar[dict[tuple[tuple[str, ...], bool, str, int, int], list[str]]] = {}
+    _pools_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        country_or_region: str,
+        match_real_world_occurrences: bool = False,
+        shared_faker: bool = True,
+        strategy_pool_size: Optional[int] = None,
+        strategy_pool_seed: int = 0,
+        pool_dir: Optional[Path] = None,
+    ):
         self.country_or_region = country_or_region
-        self.faker_data = FakerData(
+        self.match_real_world_occurrences = match_real_world_occurrences
+        self.strategy_pool_size = strategy_pool_size
+        self.strategy_pool_seed = strategy_pool_seed
+        self.pool_dir = Path(pool_dir) if pool_dir is not None else None
+        faker_data = FakerData.shared if shared_faker else FakerData
+        self.faker_data = faker_data(
             self.country_or_region,
             match_real_world_occurrences=match_real_world_occurrences,
         )
+        self._faker_is_shared = shared_faker
+        self._pools: dict[tuple[tuple[str, ...], bool, str, int, None], list[str]] = {}
+        country_codes = CountryCodes.for_locale(country_or_region)
+        self._locales = (country_codes,) if isinstance(country_codes, str) else tuple(country_codes)
+        self.isin_generator = ISINGenerator([country_codes] if isinstance(country_codes, str) else country_codes)
+
+    def _own_faker_data(self) -> FakerData:
+        """`Faker` instance which only this test data uses, replacing the shared instance on first use."""
+        if self._faker_is_shared:
+            self.faker_data = FakerData(
+                self.country_or_region, match_real_world_occurrences=self.match_real_world_occurrences
+            )
+            self._faker_is_shared = False
+        return self.faker_data
+
+    def reseed(self, seed: Optional[int] = None) -> None:
+        """Seed the `Faker` instance of this test data, so that the following values are reproducible."""
+        self._own_faker_data().seed_instance(seed)
+
+    def pool(self, field: str, pool_size: int, seed: Optional[int] = None) -> list[str]:
+        """Pre-sampled values for a field, generated once per field, pool size and seed and then reused.
+
+        Seeded pools are shared by all test data in the process with the same locales and weighting, so that test data
+        created per test does not generate them again. Pools without a seed belong to this test data only.
+
+        Parameters:
+            `field`: One of `TestData.fields`.
+            `pool_size`: Number of values in the pool.
+            `seed`: Seed for reproducible pools.
+        """
+        if field not in self.fields:
+            raise ValueError(f"Unknown test data field '{field}', expected one of {', '.join(self.fields)}.")
+        key = (self._locales, self.match_real_world_occurrences, field, pool_size, seed)
+        pools = self._pools if seed is None else self._seeded_pools
+
+        pool_file = None
+        if self.pool_dir is not None and seed is not None:
+            weighting = "weighted" if self.match_real_world_occurrences else "uniform"
+            pool_file = self.pool_dir / f"{self.country_or_region}-{weighting}-{field}-{pool_size}-{seed}.json"
+
+        with self._pools_lock:
+            if key not in pools:
+                if pool_file is not None and pool_file.is_file():
+                    pools[key] = json.loads(pool_file.read_text(encoding="utf-8"))
+                else:
+                    if seed is not None:
+                        self._own_faker_data().seed_instance(f"{seed}-{field}")
+                    provider = getattr(self, field)
+                    pools[key] = [provider() for _ in range(pool_size)]
+            pool = pools[key]
+
+        if pool_file is not None and not pool_file.is_file():
+            pool_file.parent.mkdir(parents=True, exist_ok=True)
+            temporary_file = pool_file.with_name(f".{pool_file.name}.{os.getpid()}.tmp")
+            temporary_file.write_text(json.dumps(pool), encoding="utf-8")
+            os.replace(temporary_file, pool_file)
+        return pool
+
+    def _strategy(self, field: str, strategy: st.SearchStrategy) -> st.SearchStrategy:
+        """Strategy drawing from the pool of the field when `strategy_pool_size` is set, otherwise `strategy`."""
+        if self.strategy_pool_size is None:
+            return strategy
+        return st.sampled_from(self.pool(field, pool_size=self.strategy_pool_size, seed=self.strategy_pool_seed))
+
+    def shard(
+        self,
+        fields: Sequence[str],
+        size: int,
+        pool_size: Optional[int],
+        seed: Optional[int],
+        shard_index: int,
+    ) -> dict[str, list[str]]:
+        """Generate one batch of rows, seeded by the master seed and the index of the batch.
+
+        A shard only depends on its arguments, and not on the shards generated before it, which is what makes
+        generation in parallel reproducible.
+        """
+        shard_seed = None if seed is None else f"{seed}-{shard_index}"
+        if pool_size is None:
+            if shard_seed is not None:
+                self._own_faker_data().seed_instance(shard_seed)
+            return {field: [getattr(self, field)() for _ in range(size)] for field in fields}
+        rng = random.Random(shard_seed)
+        return {field: rng.choices(self.pool(field, pool_size=pool_size, seed=seed), k=size) for field in fields}
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _worker_instance(country_or_region: str, match_real_world_occurrences: bool) -> "TestData":
+        """Test data for a locale, reused by all shards generated in a worker process."""
+        return TestData(country_or_region, match_real_world_occurrences=match_real_world_occurrences)
+
+    @staticmethod
+    def _worker_shard(country_or_region: str, match_real_world_occurrences: bool, *shard_args) -> dict[str, list[str]]:
+        """Generate a shard in a worker process."""
+        return TestData._worker_instance(country_or_region, match_real_world_occurrences).shard(*shard_args)
+
+    def iter_batches(
+        self,
+        n: int,
+        fields: Sequence[str],
+        batch_size: int = 100_000,
+        pool_size: Optional[int] = 10_000,
+        seed: Optional[int] = None,
+        max_workers: int = 1,
+    ) -> Iterator[dict[str, list[str]]]:
+        """Generate `n` rows of test data as columns, in batches of at most `batch_size` rows.
+
+        Values are drawn from pre-sampled pools of `pool_size` values per field, which is much faster than calling
+        `Faker` for every value. Values therefore repeat when `n` is larger than `pool_size`, and `pool_size=None`
+        calls `Faker` for every value instead. Memory use is bounded by the batch and pool sizes, not by `n`.
+
+        With `max_workers` above one, batches are generated as shards on a process pool and yielded in order. Each
+        shard is seeded from `seed` and its index, so that the rows are identical for any number of workers, as long
+        as `batch_size` is the same.
+
+        Parameters:
+            `n`: Number of rows.
+            `fields`: Fields to generate, from `TestData.fields`.
+            `batch_size`: Maximum number of rows in each batch.
+            `pool_size`: Number of pre-sampled values per field, or `None` to not use pools.
+            `seed`: Seed for reproducible test data.
+            `max_workers`: Number of processes generating batches. Default is `1`, which generates in this process.
+        """
+        unknown_fields = [field for field in fields if field not in self.fields]
+        if unknown_fields:
+            raise ValueError(f"Unknown test data fields {unknown_fields}, expected fields from {self.fields}.")
+        pool_size = None if pool_size is None else min(pool_size, max(n, 1))
+        shards = (
+            (list(fields), min(batch_size, n - start), pool_size, seed, shard_index)
+            for shard_index, start in enumerate(range(0, n, batch_size))
+        )
+
+        if max_workers <= 1:
+            for shard_args in shards:
+                yield self.shard(*shard_args)
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for shard_args in shards:
+                pending.append(
+                    executor.submit(
+                        TestData._worker_shard, self.country_or_region, self.match_real_world_occurrences, *shard_args
+                    )
+                )
+                if len(pending) >= max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def generate(
+        self,
+        n: int,
+        fields: Sequence[str],
+        pool_size: Optional[int] = 10_000,
+        seed: Optional[int] = None,
+        max_workers: int = 1,
+    ) -> dict[str, list[str]]:
+        """Generate `n` rows of test data as a column per field, see `iter_batches`."""
+        columns: dict[str, list[str]] = {field: [] for field in fields}
+        for batch in self.iter_batches(n, fields=fields, pool_size=pool_size, seed=seed, max_workers=max_workers):
+            for field, values in batch.items():
+                columns[field].extend(values)
+        return columns
 
     def company(self) -> str:
         """Return a single fake company name without using Hypothesis."""
@@ -149,7 +489,7 @@ class TestData:
 
     def company_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating company names."""
-        return st.builds(self.faker_data.company)
+        return self._strategy("company", st.builds(self.faker_data.company))
 
     def currency_code(self) -> str:
         """Return a single fake currency code."""
@@ -157,7 +497,7 @@ class TestData:
 
     def currency_code_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating currency codes."""
-        return st.builds(self.faker_data.currency_code)
+        return self._strategy("currency_code", st.builds(self.faker_data.currency_code))
 
     def first_name(self) -> str:
         """Return a single fake first name."""
@@ -165,18 +505,18 @@ class TestData:
 
     def first_name_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating first names."""
-        return st.builds(self.faker_data.first_name)
+        return self._strategy("first_name", st.builds(self.faker_data.first_name))
 
     def isin(self) -> str:
-        """Return a single ISIN-like string based on the locale."""
-        regex_map = {"sweden": "SE##########", "finland": "FI##########"}
-        pattern = regex_map.get(self.country_or_region, "XX##########")
-        return self.faker_data.numerify(text=pattern)
+        """Return a single ISIN with a valid check digit, for a country of the locale."""
+        return self.isin_generator.from_number(
+            self.faker_data.random_element(self.isin_generator.countries),
+            self.faker_data.random_int(min=0, max=999_999_999),
+        )
 
     def isin_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating isin numbers."""
-        regex_map = {"sweden": r"\ASE[0-9]{10}\Z", "finland": r"\AFI[0-9]{10}\Z"}
-        return st.from_regex(regex_map.get(self.country_or_region, r"\A[X]{2}[A-Z0-9]{9}[0-9]\Z"))
+        return self._strategy("isin", self.isin_generator.strategy())
 
     def last_name(self) -> str:
         """Return a single fake last name."""
@@ -184,7 +524,7 @@ class TestData:
 
     def last_name_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating isin last names."""
-        return st.builds(self.faker_data.last_name)
+        return self._strategy("last_name", st.builds(self.faker_data.last_name))
 
     def ssn(self) -> str:
         """Return a single fake SSN."""
@@ -192,4 +532,4 @@ class TestData:
 
     def ssn_st(self) -> st.SearchStrategy:
         """Hypothesis strategy for generating social security numbers."""
-        return st.builds(self.faker_data.ssn)
+        return self._strategy("ssn", st.builds(self.faker_data.ssn))
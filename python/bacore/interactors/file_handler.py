@@ -1,28 +1,237 @@
 """File handling interactors."""
 
-import subprocess as sup
-from bacore.domain.responses import DeletedFilesR
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from bacore.domain.files import FileEntry
+from bacore.domain.responses import (
+    DeletedFilesR,
+    DeletionPlanR,
+    DirectoryDeletionR,
+    DuplicateFilesGroupR,
+    DuplicateFilesR,
+    MirroredFilesR,
+)
 from bacore.domain.protocols import SupportsRetrieveDict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from fnmatch import fnmatch
+from itertools import islice
 from pathlib import Path
 from pydantic import Field, validate_call
-from typing import Annotated, Optional
+from typing import Annotated, Callable, Iterator, Optional
+
+try:
+    from bacore._bacore import FileWalker
+except ImportError:
+    FileWalker = None
 
 
 def get_files_in_dir(directory: Path, recursive: bool, pattern: str = "*") -> list[Path]:
     """Get list of files as path objects from a directory matching a pattern.
 
+    The directory is walked by the native `FileWalker` of the `_bacore` extension when it is built and the pattern
+    matches file names only. Either way, the files are sorted by path.
+
     Args:
         `directory` (Path): The directory to search in.
         `recursive` (bool): Whether to search recursively.
         `pattern` (str): The pattern to match files against.
 
     Returns:
-        `list[Path`: A list of Path objects for each file found.
+        `list[Path`: A list of Path objects for each file found, sorted by path.
+    """
+    if FileWalker is not None and "/" not in pattern and os.sep not in pattern:
+        files = [file.path for file in iter_files_in_dir(directory=directory, recursive=recursive, pattern=pattern)]
+    else:
+        find_function = directory.rglob if recursive else directory.glob
+        files = [file_path for file_path in find_function(pattern) if file_path.is_file()]
+
+    return sorted(files)
+
+
+def iter_files_in_dir(
+    directory: Path,
+    recursive: bool,
+    pattern: str = "*",
+    modified_before: Optional[float] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> Iterator[FileEntry]:
+    """Walk a directory lazily and yield files matching a pattern and filters.
+
+    When the `_bacore` extension is built, the directory is walked by its `FileWalker` on background threads, without
+    holding the GIL. Otherwise directories are read with `os.scandir`, one at a time. The order of the files is
+    unspecified, use `get_files_in_dir` for files sorted by path. Either way, each file is stat'ed
+    once and symbolic links to directories are not followed.
+
+    Args:
+        `directory` (Path): The directory to search in.
+        `recursive` (bool): Whether to search recursively.
+        `pattern` (str): The pattern to match file names against. Patterns with a path separator are matched with
+            `Path.glob` instead.
+        `modified_before` (Optional[float]): Only yield files modified before this time, as seconds since the epoch.
+        `min_size` (Optional[int]): Only yield files of at least this size in bytes.
+        `max_size` (Optional[int]): Only yield files of at most this size in bytes.
+    """
+    if "/" in pattern or os.sep in pattern:
+        find_function = directory.rglob if recursive else directory.glob
+        files = (
+            FileEntry(path=file_path, size=stat.st_size, mtime=stat.st_mtime)
+            for file_path in find_function(pattern)
+            if file_path.is_file() and (stat := file_path.stat())
+        )
+    elif FileWalker is not None:
+        walker = FileWalker(
+            str(directory),
+            pattern=pattern,
+            recursive=recursive,
+            modified_before=modified_before,
+            min_size=min_size,
+            max_size=max_size,
+        )
+        for batch in walker:
+            for file_path, size, mtime in batch:
+                yield FileEntry(path=Path(file_path), size=size, mtime=mtime)
+        return
+    else:
+
+        def scan() -> Iterator[FileEntry]:
+            """Read directories with `os.scandir`, depth first and in the order of `Path.rglob`."""
+            directories = [directory]
+            while directories:
+                try:
+                    with os.scandir(directories.pop()) as entries:
+                        subdirectories = []
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirectories.append(entry.path)
+                            elif fnmatch(entry.name, pattern) and entry.is_file():
+                                stat = entry.stat()
+                                yield FileEntry(path=Path(entry.path), size=stat.st_size, mtime=stat.st_mtime)
+                except (FileNotFoundError, NotADirectoryError, PermissionError):
+                    continue
+                if recursive:
+                    directories.extend(reversed(subdirectories))
+
+        files = scan()
+
+    for file in files:
+        if (
+            (modified_before is None or file.mtime < modified_before)
+            and (min_size is None or file.size >= min_size)
+            and (max_size is None or file.size <= max_size)
+        ):
+            yield file
+
+
+def file_digest(path: Path, length: Optional[int] = None, mmap_threshold: int = 2**24) -> str:
+    """Content address of a file, as the BLAKE2b hex digest of its content.
+
+    Files of at least `mmap_threshold` bytes are memory-mapped and hashed in slices without copying them into Python
+    objects. Hashing large slices releases the GIL, so that files can be hashed in parallel on threads.
+
+    Args:
+        `path` (Path): The file to hash.
+        `length` (Optional[int]): Only hash the first `length` bytes of the file. Default is the whole file.
+        `mmap_threshold` (int): Size in bytes from which files are memory-mapped. Default is 16 MiB.
+    """
+    chunk_size = 2**20
+    file_hash = hashlib.blake2b()
+    with path.open("rb") as file:
+        size = os.fstat(file.fileno()).st_size if length is None else min(os.fstat(file.fileno()).st_size, length)
+        if size >= mmap_threshold and size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, size, chunk_size):
+                    file_hash.update(view[offset : min(offset + chunk_size, size)])
+        else:
+            while size > 0 and (chunk := file.read(min(chunk_size, size))):
+                file_hash.update(chunk)
+                size -= len(chunk)
+    return file_hash.hexdigest()
+
+
+@validate_call
+def find_duplicate_files(
+    directory: Path,
+    pattern: str = "*",
+    recursive: bool = True,
+    min_size: Annotated[int, Field(ge=1)] = 1,
+    head_bytes: Annotated[int, Field(ge=1)] = 2**16,
+    max_workers: Annotated[int, Field(ge=1)] = 4,
+) -> DuplicateFilesR:
+    """Find groups of files with identical content.
+
+    Files are grouped by size first, as files of different sizes can not be duplicates. Files sharing a size are
+    hashed on the first `head_bytes` bytes, and only files which still collide are hashed in full, with
+    `file_digest`. Most files are therefore never read, and few are read in full.
+
+    Args:
+        `directory` (Path): The directory to search in.
+        `pattern` (str): The pattern to match file names against.
+        `recursive` (bool): Whether to search recursively. Default is `True`.
+        `min_size` (int): Only consider files of at least this size in bytes. Default is `1`, which skips empty files.
+        `head_bytes` (int): Number of bytes hashed before deciding to hash a file in full. Default is 64 KiB.
+        `max_workers` (int): Number of threads hashing files. Default is `4`.
+
+    Returns:
+        `DuplicateFilesR`: The duplicate groups, largest waste of storage first.
     """
-    find_function = directory.rglob if recursive else directory.glob
+    start = time.monotonic()
+    number_of_files = 0
+    number_of_files_hashed = 0
+    files_by_size: dict[int, list[FileEntry]] = defaultdict(list)
+    for file in iter_files_in_dir(directory=directory, recursive=recursive, pattern=pattern, min_size=min_size):
+        number_of_files += 1
+        files_by_size[file.size].append(file)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def group_by_digest(groups: list[list[FileEntry]], length: Optional[int]) -> dict[tuple, list[FileEntry]]:
+            """Split groups of files by the digest of their first `length` bytes and drop the unique files."""
+            nonlocal number_of_files_hashed
+
+            def digest(file: FileEntry) -> Optional[str]:
+                """Digest of file, or `None` if the file has gone."""
+                try:
+                    return file_digest(file.path, length=length)
+                except FileNotFoundError:
+                    return None
 
-    return [file_path for file_path in find_function(pattern) if file_path.is_file()]
+            files = [file for group in groups for file in group]
+            number_of_files_hashed += len(files)
+            digest_groups: dict[tuple, list[FileEntry]] = defaultdict(list)
+            for file, file_hash in zip(files, executor.map(digest, files)):
+                if file_hash is not None:
+                    digest_groups[(file.size, file_hash)].append(file)
+            return {key: group for key, group in digest_groups.items() if len(group) > 1}
+
+        head_groups = group_by_digest([group for group in files_by_size.values() if len(group) > 1], length=head_bytes)
+        # Files no larger than the head are already hashed in full.
+        duplicate_groups = {key: group for key, group in head_groups.items() if key[0] <= head_bytes}
+        duplicate_groups.update(
+            group_by_digest([group for key, group in head_groups.items() if key[0] > head_bytes], length=None)
+        )
+
+    return DuplicateFilesR(
+        path=directory,
+        pattern=pattern,
+        recursive=recursive,
+        number_of_files=number_of_files,
+        number_of_files_hashed=number_of_files_hashed,
+        duplicate_groups=[
+            DuplicateFilesGroupR(digest=digest, size=size, files=sorted(file.path for file in group))
+            for (size, digest), group in sorted(
+                duplicate_groups.items(), key=lambda item: item[0][0] * (len(item[1]) - 1), reverse=True
+            )
+        ],
+        wasted_bytes=sum(size * (len(group) - 1) for (size, _), group in duplicate_groups.items()),
+        elapsed_seconds=time.monotonic() - start,
+    )
 
 
 @validate_call
@@ -31,35 +240,258 @@ def delete_files(
     pattern: str = "*",
     older_than_days: Annotated[int, Field(ge=0)] = 0,
     recursive: bool = False,
+    max_workers: Annotated[int, Field(ge=1)] = 1,
+    max_recorded_files: Optional[Annotated[int, Field(ge=0)]] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    max_files_per_second: Optional[Annotated[float, Field(gt=0)]] = None,
+    max_mb_per_second: Optional[Annotated[float, Field(gt=0)]] = None,
 ) -> DeletedFilesR:
     """Delete files older than x days.
 
+    Files are streamed from the directory walk and deleted in batches, so that memory use does not grow with the
+    number of files. Deletion can be throttled, to not saturate the I/O of a shared file system. Use
+    `plan_file_deletion` to see what would be deleted.
+
     Args:
         path (`Path`): Path to search for files.
         pattern (`str`): Pattern to search for files.
         older_than_days (`int`): Delete files older than x dyas. Default is `0`. Negative values are not allowed.
         recursive (`bool`): Optionally delete files recursively. Default is `False`.
+        max_workers (`int`): Number of threads deleting files. Default is `1`, more helps on network file systems.
+        max_recorded_files (`Optional[int]`): Maximum number of deleted files to list, sorted by path, in the response.
+            Default is `None`, which lists all deleted files.
+        progress (`Optional[Callable[[int, int], None]]`): Called after each batch of deleted files, with the number
+            of deleted files and the bytes freed so far.
+        max_files_per_second (`Optional[float]`): Limit the rate of deleted files. Default is no limit.
+        max_mb_per_second (`Optional[float]`): Limit the rate of freed megabytes (2^20 bytes). Default is no limit.
     """
+    started_at = datetime.now()
+    start = time.monotonic()
     number_of_deleted_files = 0
+    bytes_freed = 0
     deleted_files = []
-    now = datetime.now()
-    files_matching_pattern = get_files_in_dir(directory=path, recursive=recursive, pattern=pattern)
+    deleted_files_truncated = False
+    cutoff = (started_at - timedelta(days=older_than_days)).timestamp()
+    expired_files = iter_files_in_dir(directory=path, recursive=recursive, pattern=pattern, modified_before=cutoff)
+    throttled = max_files_per_second is not None or max_mb_per_second is not None
+
+    def throttle(files: Iterator[FileEntry]) -> Iterator[FileEntry]:
+        """Hold back each file until deleting it keeps within the rate limits."""
+        released_files = 0
+        released_bytes = 0
+        for file in files:
+            earliest = max(
+                released_files / max_files_per_second if max_files_per_second else 0.0,
+                released_bytes / (max_mb_per_second * 2**20) if max_mb_per_second else 0.0,
+            )
+            delay = start + earliest - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            released_files += 1
+            released_bytes += file.size
+            yield file
+
+    if throttled:
+        expired_files = throttle(expired_files)
 
-    for file in files_matching_pattern:
-        file_modification_time = file.stat().st_mtime
+    def unlink(file: FileEntry) -> bool:
+        """Delete file and return `False` if the file was already gone."""
+        try:
+            file.path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
 
-        if file_modification_time < (now - timedelta(days=older_than_days)).timestamp():
-            file.unlink()
-            deleted_files.append(file)
-            number_of_deleted_files += 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while batch := list(islice(expired_files, max_workers if throttled else max_workers * 64)):
+            unlink_results = executor.map(unlink, batch) if max_workers > 1 else map(unlink, batch)
+            for file, deleted in zip(batch, unlink_results):
+                if not deleted:
+                    continue
+                number_of_deleted_files += 1
+                bytes_freed += file.size
+                if max_recorded_files is None or len(deleted_files) < max_recorded_files:
+                    deleted_files.append(file.path)
+                else:
+                    deleted_files_truncated = True
+            if progress is not None:
+                progress(number_of_deleted_files, bytes_freed)
 
+    elapsed_seconds = time.monotonic() - start
     return DeletedFilesR(
         path=path,
         pattern=pattern,
         older_than_days=older_than_days,
         recursive=recursive,
         number_of_deleted_files=number_of_deleted_files,
-        deleted_files=deleted_files,
+        deleted_files=sorted(deleted_files),
+        bytes_freed=bytes_freed,
+        deleted_files_truncated=deleted_files_truncated,
+        started_at=started_at,
+        elapsed_seconds=elapsed_seconds,
+        files_per_second=number_of_deleted_files / elapsed_seconds if elapsed_seconds else 0.0,
+        mb_per_second=bytes_freed / 2**20 / elapsed_seconds if elapsed_seconds else 0.0,
+    )
+
+
+@validate_call
+def plan_file_deletion(
+    path: Path,
+    pattern: str = "*",
+    older_than_days: Annotated[int, Field(ge=0)] = 0,
+    recursive: bool = False,
+) -> DeletionPlanR:
+    """Summarize the files which `delete_files` would delete with the same arguments, without deleting anything.
+
+    The plan is made in a single pass over the directory, with one stat per file.
+
+    Args:
+        path (`Path`): Path to search for files.
+        pattern (`str`): Pattern to search for files.
+        older_than_days (`int`): Include files older than x days. Default is `0`. Negative values are not allowed.
+        recursive (`bool`): Optionally include files recursively. Default is `False`.
+    """
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).timestamp()
+    number_of_files = 0
+    total_bytes = 0
+    oldest_mtime = None
+    newest_mtime = None
+    directories: dict[Path, DirectoryDeletionR] = {}
+
+    for file in iter_files_in_dir(directory=path, recursive=recursive, pattern=pattern, modified_before=cutoff):
+        number_of_files += 1
+        total_bytes += file.size
+        oldest_mtime = file.mtime if oldest_mtime is None else min(oldest_mtime, file.mtime)
+        newest_mtime = file.mtime if newest_mtime is None else max(newest_mtime, file.mtime)
+        directory = directories.setdefault(file.path.parent, DirectoryDeletionR())
+        directory.number_of_files += 1
+        directory.total_bytes += file.size
+
+    return DeletionPlanR(
+        path=path,
+        pattern=pattern,
+        older_than_days=older_than_days,
+        recursive=recursive,
+        number_of_files=number_of_files,
+        total_bytes=total_bytes,
+        oldest_modified=datetime.fromtimestamp(oldest_mtime) if oldest_mtime is not None else None,
+        newest_modified=datetime.fromtimestamp(newest_mtime) if newest_mtime is not None else None,
+        directories=directories,
+    )
+
+
+@validate_call
+def mirror_files(
+    source: Path,
+    destination: Path,
+    pattern: str = "*",
+    recursive: bool = True,
+    delete: bool = True,
+    checksum: bool = False,
+    max_workers: Annotated[int, Field(ge=1)] = 4,
+) -> MirroredFilesR:
+    """Mirror files from source to destination, copying only the files which have changed.
+
+    Files are compared by size and modification time, or by size and content hash with `checksum`. Changed files
+    are copied on a thread pool, with `os.copy_file_range` where the platform supports it and `shutil.copyfile`
+    otherwise, which uses `sendfile` or `fcopyfile`. Each file is written to a temporary file next to the destination
+    and moved into place, so that an interrupted mirror never leaves a partial file behind.
+
+    Args:
+        source (`Path`): Directory to copy files from.
+        destination (`Path`): Directory to copy files to, created if it does not exist.
+        pattern (`str`): Pattern to match file names against. Default is all files.
+        recursive (`bool`): Mirror subdirectories. Default is `True`.
+        delete (`bool`): Delete files matching the pattern in destination which are not in source, and the
+            directories left empty. Default is `True`.
+        checksum (`bool`): Compare files of the same size by content instead of modification time. Default is
+            `False`.
+        max_workers (`int`): Number of threads copying files. Default is `4`.
+    """
+    started_at = datetime.now()
+    start = time.monotonic()
+    source_files = {
+        file.path.relative_to(source): file
+        for file in iter_files_in_dir(directory=source, recursive=recursive, pattern=pattern)
+    }
+    destination_files = {
+        file.path.relative_to(destination): file
+        for file in iter_files_in_dir(directory=destination, recursive=recursive, pattern=pattern)
+    }
+
+    def unchanged(relative_path: Path) -> bool:
+        """Whether the destination file already has the content of the source file."""
+        source_file = source_files[relative_path]
+        destination_file = destination_files.get(relative_path)
+        if destination_file is None or destination_file.size != source_file.size:
+            return False
+        if checksum:
+            return file_digest(source_file.path) == file_digest(destination_file.path)
+        return destination_file.mtime == source_file.mtime
+
+    def copy(relative_path: Path) -> int:
+        """Copy file to a temporary file in destination and move it into place, returning the bytes copied."""
+        source_path = source_files[relative_path].path
+        destination_path = destination / relative_path
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_fd, temporary_name = tempfile.mkstemp(
+            dir=destination_path.parent, prefix=f".{destination_path.name}.", suffix=".tmp"
+        )
+        os.close(temporary_fd)
+        temporary_path = Path(temporary_name)
+        try:
+            bytes_copied = 0
+            if hasattr(os, "copy_file_range"):
+                with source_path.open("rb") as source_file, temporary_path.open("wb") as temporary_file:
+                    try:
+                        while chunk := os.copy_file_range(source_file.fileno(), temporary_file.fileno(), 2**30):
+                            bytes_copied += chunk
+                    except OSError:
+                        bytes_copied = 0
+            # Some file systems return 0 from copy_file_range instead of raising, which would leave the file empty.
+            if bytes_copied < source_path.stat().st_size:
+                shutil.copyfile(source_path, temporary_path)
+            shutil.copystat(source_path, temporary_path)
+            os.replace(temporary_path, destination_path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        return source_files[relative_path].size
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        changed_files = [
+            relative_path
+            for relative_path, is_unchanged in zip(source_files, executor.map(unchanged, source_files))
+            if not is_unchanged
+        ]
+        bytes_transferred = sum(executor.map(copy, changed_files))
+
+    files_deleted = 0
+    if delete:
+        extraneous_files = [relative_path for relative_path in destination_files if relative_path not in source_files]
+        for relative_path in extraneous_files:
+            (destination / relative_path).unlink(missing_ok=True)
+            files_deleted += 1
+        for directory in sorted({relative_path.parent for relative_path in extraneous_files}, reverse=True):
+            for parent in (directory, *directory.parents):
+                if parent == Path(".") or (source / parent).is_dir():
+                    break
+                try:
+                    (destination / parent).rmdir()
+                except OSError:
+                    break
+
+    elapsed_seconds = time.monotonic() - start
+    return MirroredFilesR(
+        source=source,
+        destination=destination,
+        pattern=pattern,
+        files_copied=len(changed_files),
+        files_deleted=files_deleted,
+        files_skipped=len(source_files) - len(changed_files),
+        bytes_transferred=bytes_transferred,
+        started_at=started_at,
+        elapsed_seconds=elapsed_seconds,
+        mb_per_second=bytes_transferred / 2**20 / elapsed_seconds if elapsed_seconds else 0.0,
     )
 
 
@@ -68,12 +500,11 @@ def file_as_dict(file: SupportsRetrieveDict) -> dict:
     return file.data_to_dict()
 
 
-def rsync_copy(source: Path, destination: Path, file_filter: Optional[str]):
-    """Use rsync to mirror files and folders from src to dest."""
-    command = ["rsync", "-av", "--delete", f"{source}/{file_filter}", str(destination)]
-    try:
-        sup.run(command, check=True)
-    except FileNotFoundError:
+def rsync_copy(source: Path, destination: Path, file_filter: Optional[str]) -> MirroredFilesR:
+    """Mirror files and folders from src to dest, like `rsync -a --delete`.
+
+    Kept for backwards compatibility, use `mirror_files` for the full set of options.
+    """
+    if not source.is_dir():
         raise FileNotFoundError("Unable to find file or directory to copy.")
-    except sup.CalledProcessError as e:
-        raise RuntimeError(f"Rsync failed: {e}")
+    return mirror_files(source=source, destination=destination, pattern=file_filter or "*")
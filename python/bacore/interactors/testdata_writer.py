@@ -0,0 +1,89 @@
+"""Test data writing interactors."""
+
+import csv
+import sqlite3
+import time
+from bacore.domain.responses import WrittenTestDataR
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def write_test_data(
+    path: Path,
+    batches: Iterable[dict[str, list]],
+    file_format: Optional[str] = None,
+    table: str = "test_data",
+) -> WrittenTestDataR:
+    """Write batches of columnar test data to a CSV, Parquet or SQLite file.
+
+    Batches are written one at a time, so that memory use is bounded by the batch size and not by the number of rows.
+    Use with `TestData.iter_batches`.
+
+    Args:
+        path (`Path`): File to write, which is replaced for CSV and Parquet and appended to for SQLite.
+        batches (`Iterable[dict[str, list]]`): Batches of rows as a list of values per field.
+        file_format (`Optional[str]`): One of `csv`, `parquet` or `sqlite`. Default is the format of the file suffix.
+        table (`str`): Table to create or append to in SQLite. Default is `test_data`.
+    """
+    file_format = file_format or {".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite"}.get(
+        path.suffix, path.suffix.lstrip(".")
+    )
+    start = time.monotonic()
+    batches = iter(batches)
+    first_batch = next(batches, {})
+    fields = list(first_batch)
+    batches = chain([first_batch], batches) if fields else iter(())
+    number_of_rows = 0
+
+    if file_format == "csv":
+        with path.open("w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(fields)
+            for batch in batches:
+                rows = list(zip(*batch.values()))
+                writer.writerows(rows)
+                number_of_rows += len(rows)
+    elif file_format == "parquet":
+        if pa is None:
+            raise ImportError("Writing Parquet files requires pyarrow, install it with `pip install pyarrow`.")
+        writer = None
+        try:
+            for batch in batches:
+                record_batch = pa.RecordBatch.from_pydict(batch)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, record_batch.schema)
+                writer.write_batch(record_batch)
+                number_of_rows += record_batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+    elif file_format == "sqlite":
+        columns = ", ".join(f'"{field}"' for field in fields)
+        placeholders = ", ".join("?" for _ in fields)
+        with sqlite3.connect(path) as connection:
+            if fields:
+                connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+            for batch in batches:
+                rows = list(zip(*batch.values()))
+                connection.executemany(f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders})', rows)
+                connection.commit()
+                number_of_rows += len(rows)
+        connection.close()
+    else:
+        raise ValueError(f"Unsupported test data file format '{file_format}', expected csv, parquet or sqlite.")
+
+    return WrittenTestDataR(
+        path=path,
+        file_format=file_format,
+        fields=fields,
+        number_of_rows=number_of_rows,
+        elapsed_seconds=time.monotonic() - start,
+    )
@@ -5,15 +5,25 @@ Refer to this example for understanding on how to
 [write JavaScript with FastHTML](https://github.com/AnswerDotAI/fasthtml/blob/main/fasthtml/js.py).
 
 - [Rendering markdown after processing](https://docs.fastht.ml/tutorials/by_example.html#custom-scripts-and-styling).
+
+# Markdown
+Markdown is rendered to HTML on the server by `markdown_renderer` when markdown-it-py is installed (with the `web`
+extra), and is otherwise left to `MarkdownJS` to render in the browser.
 """
 
+import hashlib
+import threading
+import time
 from bacore.domain.files import MarkdownFile
 from bacore.domain.source_code import (
     ClassModel,
     DirectoryModel,
     FunctionModel,
     ModuleModel,
+    StaticClassModel,
+    StaticFunctionModel,
 )
+from fastcore.xml import Html
 from fasthtml.common import (
     A,
     Aside,
@@ -22,14 +32,33 @@ from fasthtml.common import (
     H2,
     H3,
     H4,
+    Body,
+    Head,
+    HTMLResponse,
+    FT,
     Li,
     Link,
     Nav,
+    NotStr,
     P,
+    Request,
+    Response,
     Ul,
+    Title,
     Titled,
+    to_xml,
 )
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from pydantic import PrivateAttr
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Hashable, Iterable, Mapping, Optional
+
+try:
+    from markdown_it import MarkdownIt
+except ImportError:
+    MarkdownIt = None
 
 flexboxgrid = Link(
     rel="stylesheet",
@@ -38,12 +67,62 @@ flexboxgrid = Link(
 )
 
 
+class MarkdownRenderer:
+    """Markdown rendered to HTML on the server, where the least recently used HTML is evicted when `max_entries` is
+    reached.
+
+    Rendered HTML is cached by a hash of the markdown, so that docstrings and files are only rendered again when their
+    content changes. Without markdown-it-py installed, or with `server_side=False`, markdown is wrapped in a
+    `marked` element for `MarkdownJS` to render in the browser.
+    """
+
+    def __init__(self, max_entries: int = 1024, server_side: bool = True):
+        self.max_entries = max_entries
+        self._markdown = MarkdownIt("commonmark").enable("table") if server_side and MarkdownIt is not None else None
+        self._html: OrderedDict[bytes, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._html)
+
+    @property
+    def server_side(self) -> bool:
+        """Whether markdown is rendered on the server."""
+        return self._markdown is not None
+
+    def html(self, text: str) -> str:
+        """Markdown rendered as HTML."""
+        if self._markdown is None:
+            raise RuntimeError("Server side markdown rendering requires markdown-it-py, install `bacore[web]`.")
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._lock:
+            html = self._html.get(key)
+            if html is not None:
+                self._html.move_to_end(key)
+                return html
+        html = self._markdown.render(text)
+        with self._lock:
+            self._html[key] = html
+            while len(self._html) > self.max_entries:
+                self._html.popitem(last=False)
+        return html
+
+    def __call__(self, text: Optional[str], tag: Callable[..., FT] = Div) -> FT:
+        """Markdown as a component, with HTML rendered on the server or markdown in a `tag` for `MarkdownJS`."""
+        if not text or not self.server_side:
+            return tag(text, cls="marked")
+        return Div(NotStr(self.html(text)), cls="markdown")
+
+
+markdown_renderer = MarkdownRenderer()
+
+
 class MarkdownFT(MarkdownFile):
     """Markdown class."""
 
     def __ft__(self):
         """Markdown file renedered as HTML."""
-        return Div(self.read(), cls="marked")
+        return markdown_renderer(self.read())
 
 
 class FuncFT(FunctionModel):
@@ -51,7 +130,7 @@ class FuncFT(FunctionModel):
 
     def __ft__(self):
         """Function model rendered as HTML."""
-        return Div(self.doc, cls="marked")
+        return markdown_renderer(self.doc)
 
 
 class ClassFT(ClassModel):
@@ -59,7 +138,7 @@ class ClassFT(ClassModel):
 
     def __ft__(self):
         """Class docstrings rendered as HTML."""
-        return Div(self.doc, cls="marked")
+        return markdown_renderer(self.doc)
 
 
 class ModuleFT(ModuleModel):
@@ -67,7 +146,7 @@ class ModuleFT(ModuleModel):
 
     def __ft__(self):
         """Module docstring rendered as HTML."""
-        return Div(self.doc, cls="marked")
+        return markdown_renderer(self.doc)
 
     def classes(self):
         return Div("# Heading of classes\nSome text", cls="marked")
@@ -93,12 +172,8 @@ def map_uri_to_module(
         directory_model: The directory model to traverse
         package_root: The package to be considered as base package.
     """
-    path_module_mappings = {uri_to(module): module.model_copy() for module in directory_model.modules}
-
-    for subdirectory in directory_model.directories:
-        path_module_mappings.update(map_uri_to_module(subdirectory))
-
-    return path_module_mappings
+    modules = (module_entry.model() for module_entry in directory_model.iter_modules(recursive=True))
+    return {uri_to(module): module for module in modules}
 
 
 class SrcDirFT(DirectoryModel):
@@ -160,10 +235,274 @@ class NavDocs(DirectoryModel):
 
 
 class Documentation(DirectoryModel):
-    """Documentation pages for project."""
+    """Documentation pages for project.
+
+    The routing table from URL to module is built on first use and kept in memory. Directories are polled for changes
+    of their modification time and size at most once every `poll_interval` seconds (never, if `None`), and only
+    directories which have changed are scanned again. Creating, removing or renaming a module changes the modification
+    time of its directory, while edits to a module do not affect the routing. A directory which was modified less than
+    `racy_window_ns` before it was scanned is scanned again on the next poll, since a change within the same tick of
+    the coarse file system clock would not change its modification time.
+    """
+
+    racy_window_ns: ClassVar[int] = 2_000_000_000
+
+    poll_interval: Optional[float] = 1.0
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _routes: Optional[dict[str, ModuleModel]] = PrivateAttr(default=None)
+    _dir_routes: dict[Path, dict[str, ModuleModel]] = PrivateAttr(default_factory=dict)
+    _dir_mtimes: dict[Path, tuple[int, int, int]] = PrivateAttr(default_factory=dict)
+    _subdirectories: dict[Path, list[Path]] = PrivateAttr(default_factory=dict)
+    _checked_at: float = PrivateAttr(default=0.0)
+    _version: int = PrivateAttr(default=0)
+
+    @property
+    def version(self) -> int:
+        """Number of times the routing table has been built or changed."""
+        return self._version
+
+    def _scan(self, directory: Path) -> None:
+        """Scan modules in a directory, and in subdirectories not seen before, into the routing table."""
+        scanned_at = time.time_ns()
+        try:
+            stat = directory.stat()
+            self._dir_mtimes[directory] = (stat.st_mtime_ns, stat.st_size, scanned_at)
+        except FileNotFoundError:
+            self._drop(directory)
+            return
+
+        directory_model = DirectoryModel(path=directory, package_root=self.package_root, index=self.index)
+        self._dir_routes[directory] = {uri_to(module): module for module in directory_model.modules}
+        previous_subdirectories = self._subdirectories.get(directory, [])
+        self._subdirectories[directory] = [subdirectory.path for subdirectory in directory_model.directories]
+
+        for subdirectory in set(previous_subdirectories) - set(self._subdirectories[directory]):
+            self._drop(subdirectory)
+        for subdirectory in self._subdirectories[directory]:
+            if subdirectory not in self._dir_mtimes:
+                self._scan(subdirectory)
+
+    def _drop(self, directory: Path) -> None:
+        """Remove a directory and its subdirectories from the routing table."""
+        self._dir_mtimes.pop(directory, None)
+        self._dir_routes.pop(directory, None)
+        for subdirectory in self._subdirectories.pop(directory, []):
+            self._drop(subdirectory)
+
+    def _changed_directories(self) -> list[Path]:
+        changed = []
+        for directory, (mtime, size, scanned_at) in self._dir_mtimes.items():
+            try:
+                stat = directory.stat()
+                if (stat.st_mtime_ns, stat.st_size) != (mtime, size) or scanned_at - mtime < self.racy_window_ns:
+                    changed.append(directory)
+            except FileNotFoundError:
+                changed.append(directory)
+        return changed
+
+    def _merge_routes(self, directory: Path, routes: dict[str, ModuleModel]) -> dict[str, ModuleModel]:
+        """Merge routes with modules before subdirectories, in the same order as `map_uri_to_module`."""
+        routes.update(self._dir_routes.get(directory, {}))
+        for subdirectory in self._subdirectories.get(directory, []):
+            self._merge_routes(subdirectory, routes)
+        return routes
+
+    def _refresh(self) -> None:
+        if self._routes is None:
+            self._scan(self.path)
+        else:
+            changed_directories = self._changed_directories()
+            if not changed_directories:
+                return
+            for directory in changed_directories:
+                if directory in self._dir_mtimes:  # Not dropped by a changed parent directory.
+                    self._scan(directory)
+
+        routes = self._merge_routes(self.path, {})
+        if routes != self._routes:
+            self._routes = routes
+            self._version += 1
+
+    def invalidate(self) -> None:
+        """Drop the routing table, to have it built from scratch on next use."""
+        with self._lock:
+            self._routes = None
+            self._dir_routes.clear()
+            self._dir_mtimes.clear()
+            self._subdirectories.clear()
+
+    def docs_tree(self) -> Mapping[str, ModuleModel]:
+        """Routing table from URL to module, as a read-only view of the cached table."""
+        with self._lock:
+            now = time.monotonic()
+            poll_due = self.poll_interval is not None and now - self._checked_at >= self.poll_interval
+            if self._routes is None or poll_due:
+                self._refresh()
+                self._checked_at = now
+            return MappingProxyType(self._routes)
+
+    def fingerprint(self, url: str) -> Optional[tuple[int, int, int]]:
+        """Fingerprint of the page for a URL, which changes with the routing table or the source file of the module.
+
+        Returns `None` if there is no module for the URL.
+        """
+        module = self.docs_tree().get(url)
+        if module is None:
+            return None
+        try:
+            stat = module.path.stat()
+        except FileNotFoundError:
+            return None
+        return self.version, stat.st_mtime_ns, stat.st_size
+
+
+def render_page(
+    page: Any,
+    hdrs: Iterable = (),
+    ftrs: Iterable = (),
+    bodykw: Optional[dict] = None,
+    htmlkw: Optional[dict] = None,
+    partial: bool = False,
+) -> str:
+    """Render a page to HTML in the same way as FastHTML renders the response of a route.
+
+    A full page gets a complete document, with the title and header tags of the page in the head, followed by the
+    headers `hdrs`, and the footers `ftrs` at the end of the body. A partial page, as for an HTMX request, and a page
+    which already is an `Html` document are rendered as they are.
+    """
+    page = page if isinstance(page, tuple) else (page,)
+    header_tags = ("title", "meta", "link", "style", "base")
+    if not partial and not any(getattr(element, "tag", "") == "html" for element in page):
+        titles = [element for element in page if getattr(element, "tag", "") in header_tags]
+        body = tuple(element for element in page if getattr(element, "tag", "") not in header_tags)
+        headers, footers = (
+            [item for items in tags for item in (items if isinstance(items, (list, tuple)) else [items])]
+            for tags in (hdrs, ftrs)
+        )
+        page = Html(
+            Head(*(titles or [Title("FastHTML page")]), *headers),
+            Body(body, *footers, **(bodykw or {})),
+            **(htmlkw or {}),
+        )
+    return to_xml(page)
+
 
-    def docs_tree(self) -> dict[str, ModuleModel]:
-        return map_uri_to_module(directory_model=self)
+@dataclass(frozen=True)
+class CachedPage:
+    """Rendered HTML page with its strong entity tag."""
+
+    html: str
+    etag: str
+
+
+class PageCache:
+    """Cache of rendered HTML pages, where the least recently used page is evicted when `max_pages` is reached.
+
+    Keys should include a fingerprint of the page source (see `Documentation.fingerprint`), so that a changed
+    source gives a new key instead of a stale page.
+    """
+
+    def __init__(self, max_pages: int = 512):
+        self.max_pages = max_pages
+        self._pages: OrderedDict[Hashable, CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def put(self, key: Hashable, html: str) -> CachedPage:
+        """Store a page, with its entity tag made from a hash of the content."""
+        page = CachedPage(html=html, etag=f'"{hashlib.blake2b(html.encode(), digest_size=16).hexdigest()}"')
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def respond(self, request: Request, key: Hashable, fingerprint: Optional[Hashable], page: Callable[[], Any]) -> Any:
+        """Respond with a cached page and a strong ETag, or with 304 if the `If-None-Match` header matches.
+
+        The page is made by calling `page`, and rendered with `render`, on a cache miss. Pages without a fingerprint are rendered for every request
+        and never cached.
+        """
+        if fingerprint is None:
+            return page()
+
+        cache_key = (key, fingerprint, "hx-request" in request.headers)
+        cached_page = self.get(cache_key)
+        if cached_page is None:
+            html = self.render(request, page())
+            cached_page = self.put(cache_key, html)
+
+        headers = {"ETag": cached_page.etag}
+        if self.etag_matches(request.headers.get("if-none-match"), cached_page.etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(cached_page.html, headers=headers)
+
+    @staticmethod
+    def render(request: Request, page: Any) -> str:
+        """Render a page with `render_page`, with the headers and footers of the app, which FastHTML sets on the
+        request. An HTMX request gets the page as it is.
+        """
+        return render_page(
+            page,
+            hdrs=getattr(request, "hdrs", ()),
+            ftrs=getattr(request, "ftrs", ()),
+            bodykw=getattr(request, "bodykw", None),
+            htmlkw=getattr(request, "htmlkw", None),
+            partial="hx-request" in request.headers,
+        )
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Whether an `If-None-Match` header value matches the entity tag (with weak comparison, as for GET)."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+@dataclass(frozen=True)
+class ClassMembers:
+    """Class with its functions and sub-classes."""
+
+    klass: ClassModel | StaticClassModel
+    functions: list[FunctionModel | StaticFunctionModel]
+    classes: list[ClassModel | StaticClassModel]
+
+
+@dataclass(frozen=True)
+class ModuleMembers:
+    """Snapshot of the docstring and members of a module, collected once per rendered page."""
+
+    doc: Optional[str]
+    functions: list[FunctionModel | StaticFunctionModel]
+    classes: list[ClassMembers]
+
+    @classmethod
+    def of(cls, module: ModuleModel) -> "ModuleMembers":
+        return cls(
+            doc=module.doc,
+            functions=module.functions(),
+            classes=[
+                ClassMembers(klass=klass, functions=klass.functions(), classes=klass.classes())
+                for klass in module.classes()
+            ],
+        )
 
 
 def doc_page(doc_source: Documentation, url: str) -> Titled:
@@ -176,69 +515,68 @@ def doc_page(doc_source: Documentation, url: str) -> Titled:
     if module is None:
         raise ValueError(f'404 module "{url}" does not exist')
 
-    funcs = module.functions()
-    classes = module.classes()
+    members = ModuleMembers.of(module)
 
     return Div(
-        Div(module.doc, cls="marked"),
+        markdown_renderer(members.doc),
         (
             Div(
                 H1("Module Functions"),
-                Ul(*[Li(func.name.title()) for func in funcs]),
-                Div(*[(H2(func.name.title()), P(func.doc, cls="marked")) for func in funcs]),
+                Ul(*[Li(func.name.title()) for func in members.functions]),
+                Div(*[(H2(func.name.title()), markdown_renderer(func.doc, tag=P)) for func in members.functions]),
             )
-            if funcs
+            if members.functions
             else ""
         ),
         (
             Div(
                 H1("Module Classes"),
-                Ul(*[Li(klass.name.title()) for klass in classes]),
+                Ul(*[Li(class_members.klass.name.title()) for class_members in members.classes]),
                 Div(
                     *[
                         (
-                            H2(klass.name.title()),
-                            P(klass.doc, cls="marked"),
+                            H2(class_members.klass.name.title()),
+                            markdown_renderer(class_members.klass.doc, tag=P),
                             (
                                 Div(
                                     H3("Class Functions"),
-                                    Ul(*[Li(class_func.name.title()) for class_func in klass.functions()]),
+                                    Ul(*[Li(class_func.name.title()) for class_func in class_members.functions]),
                                     Div(
                                         *[
                                             (
                                                 H4(class_func.name.title()),
-                                                P(class_func.doc, cls="marked"),
+                                                markdown_renderer(class_func.doc, tag=P),
                                             )
-                                            for class_func in klass.functions()
+                                            for class_func in class_members.functions
                                         ]
                                     ),
                                 )
-                                if klass.functions()
+                                if class_members.functions
                                 else ""
                             ),
                             (
                                 Div(
                                     H3("Sub-Classes"),
-                                    Ul(*[Li(sub_class.name.title()) for sub_class in klass.classes()]),
+                                    Ul(*[Li(sub_class.name.title()) for sub_class in class_members.classes]),
                                     Div(
                                         *[
                                             (
                                                 H4(sub_class.name.title()),
-                                                P(sub_class.doc, cls="marked"),
+                                                markdown_renderer(sub_class.doc, tag=P),
                                             )
-                                            for sub_class in klass.classes()
+                                            for sub_class in class_members.classes
                                         ]
                                     ),
                                 )
-                                if klass.classes()
+                                if class_members.classes
                                 else ""
                             ),
                         )
-                        for klass in classes
+                        for class_members in members.classes
                     ]
                 ),
             )
-            if classes
+            if members.classes
             else ""
         ),
     )
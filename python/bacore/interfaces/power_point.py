@@ -1,17 +1,38 @@
 """Power point interface."""
 
+import copy
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+import weakref
 from bacore.domain.measurements import Time
+from bacore.domain.responses import PresentationBatchR, PresentationBuildR
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import OpcPackage
+from pptx.oxml.ns import qn
+from pptx.parts.image import Image as PptxImage, ImagePart
 from pptx.shapes.picture import Picture
 from pptx.slide import Slide
 from pptx.text.text import TextFrame
 from pptx.util import Cm, Emu, Inches, Length, Mm, Pt
-from sqlmodel import Field, Relationship, SQLModel
-from typing import ClassVar, Optional
+from sqlalchemy import Engine, inspect
+from sqlalchemy.orm import object_session, selectinload
+from sqlmodel import Field, Relationship, Session, SQLModel, create_engine, select
+from sqlmodel.sql.expression import Select, SelectOfScalar
+from typing import ClassVar, Iterable, Iterator, Mapping, Optional
 
 TODAY = Time().today_s
 
@@ -34,6 +55,339 @@ def match_length_type_to_class(length_type_name: str) -> Length:
     return length_class
 
 
+@dataclass(frozen=True)
+class ImageAsset:
+    """Image file content, read once, with the SHA1 fingerprint which python-pptx uses to share image parts, and the
+    native size of the image in EMU, which python-pptx otherwise reads from the image header for every picture."""
+
+    blob: bytes
+    sha1: str
+    native_width: int
+    native_height: int
+
+    def buffer(self) -> BytesIO:
+        """In-memory file for `add_picture`."""
+        return BytesIO(self.blob)
+
+    def scale(self, width: Length | None, height: Length | None) -> tuple[Emu, Emu]:
+        """Size of a picture of the image, in the same way as `add_picture`, keeping the aspect ratio for a missing
+        width or height, and the native size if both are missing."""
+        if width is None and height is None:
+            return Emu(self.native_width), Emu(self.native_height)
+        if width is None:
+            width = round(self.native_width * height / self.native_height)
+        elif height is None:
+            height = round(self.native_height * width / self.native_width)
+        return Emu(width), Emu(height)
+
+
+class ImageAssetCache:
+    """Cache of image files read into memory, where the least recently used image is evicted at `max_images`.
+
+    Each image file is read and fingerprinted once per process, per modification time and target size, instead of
+    for every picture added to a slide. With `max_dpi`, images with more pixels than needed for their size on the
+    slide at that resolution are scaled down once, which also makes the saved presentations smaller.
+
+    Pictures added with `add_picture` share one image part per image in each presentation, found by the SHA1 of the
+    asset, so that the image is neither hashed nor parsed again for each picture.
+
+    Attributes:
+        max_images (int): Maximum number of cached images. Defaults to 256.
+        max_dpi (Optional[int]): Scale images down to at most this resolution on the slide. Defaults to None, which
+            keeps images as they are.
+    """
+
+    def __init__(self, max_images: int = 256, max_dpi: int | None = None):
+        self.max_images = max_images
+        self.max_dpi = max_dpi
+        self._images: OrderedDict[tuple, ImageAsset] = OrderedDict()
+        self._image_parts: weakref.WeakKeyDictionary[OpcPackage, dict[str, ImagePart]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def _target_pixels(self, length: Length | None) -> int | None:
+        """Number of pixels for a length on the slide at `max_dpi`."""
+        if length is None or self.max_dpi is None:
+            return None
+        return max(1, round(Emu(length).inches * self.max_dpi))
+
+    def _scaled(self, blob: bytes, target_width: int | None, target_height: int | None) -> bytes:
+        """Image scaled down to the target size in pixels, keeping the aspect ratio and the image format."""
+        with Image.open(BytesIO(blob)) as image:
+            factors = [
+                target / actual
+                for target, actual in ((target_width, image.width), (target_height, image.height))
+                if target
+            ]
+            factor = max(factors) if factors else 1.0
+            if factor >= 1.0:
+                return blob
+            image_format = image.format
+            scaled = image.resize(
+                (max(1, round(image.width * factor)), max(1, round(image.height * factor))), Image.LANCZOS
+            )
+            buffer = BytesIO()
+            scaled.save(buffer, format=image_format, **({"quality": 90} if image_format == "JPEG" else {}))
+        return buffer.getvalue()
+
+    def get(self, path: str | Path, width: Length | None = None, height: Length | None = None) -> ImageAsset:
+        """Image asset for a file, scaled for the width and height on the slide when `max_dpi` is set."""
+        path = Path(path)
+        stat = path.stat()
+        target_width, target_height = self._target_pixels(width), self._target_pixels(height)
+        key = (str(path.absolute()), stat.st_mtime_ns, stat.st_size, target_width, target_height)
+        with self._lock:
+            asset = self._images.get(key)
+            if asset is not None:
+                self._images.move_to_end(key)
+                return asset
+
+        blob = path.read_bytes()
+        if target_width or target_height:
+            blob = self._scaled(blob, target_width, target_height)
+        image = PptxImage.from_blob(blob)
+        (width_px, height_px), (horizontal_dpi, vertical_dpi) = image.size, image.dpi
+        asset = ImageAsset(
+            blob=blob,
+            sha1=hashlib.sha1(blob).hexdigest(),
+            native_width=int(Inches(1) * width_px / horizontal_dpi),
+            native_height=int(Inches(1) * height_px / vertical_dpi),
+        )
+        with self._lock:
+            self._images[key] = asset
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        return asset
+
+    def add_picture(
+        self,
+        slide: Slide,
+        path: str | Path,
+        left: Length = 0,
+        top: Length = 0,
+        width: Length | None = None,
+        height: Length | None = None,
+    ) -> Picture:
+        """Add a picture of an image file to a slide, as `slide.shapes.add_picture` does.
+
+        The image part of the presentation is looked up by the SHA1 of the cached asset, and the size of the picture
+        is calculated from the cached native size, instead of hashing and parsing the image again.
+        """
+        asset = self.get(path, width=width, height=height)
+        shapes = slide.shapes
+        with self._lock:
+            image_parts = self._image_parts.setdefault(slide.part.package, {})
+            image_part = image_parts.get(asset.sha1)
+        if image_part is None:
+            image_part, rId = slide.part.get_or_add_image_part(asset.buffer())
+            with self._lock:
+                image_parts[asset.sha1] = image_part
+        else:
+            rId = slide.part.relate_to(image_part, RT.IMAGE)
+
+        shape_id = shapes._next_shape_id
+        picture_width, picture_height = asset.scale(width, height)
+        pic = shapes._spTree.add_pic(
+            shape_id, f"Picture {shape_id - 1}", image_part.desc, rId, left, top, picture_width, picture_height
+        )
+        shapes._recalculate_extents()
+        return shapes._shape_factory(pic)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._image_parts.clear()
+
+
+image_assets = ImageAssetCache()
+
+
+@dataclass(frozen=True)
+class TemplateSlide:
+    """Slide of a template, kept as parsed XML with the content of the parts its shapes refer to.
+
+    Attributes:
+        master_index (int): Index of the slide master of the slide layout.
+        layout_index (int): Index of the slide layout in its slide master.
+        elements (tuple): Shape elements of the slide, which are copied into each cloned slide.
+        background (Optional[BaseOxmlElement]): Background element of the slide, if it has its own background.
+        images (dict[str, bytes]): Image content by the relationship id which the shapes refer to.
+        external (dict[str, tuple[str, str]]): Relationship type and target by relationship id, for hyperlinks.
+        unsupported (tuple[str, ...]): Relationship types which the shapes refer to and which can not be cloned, such
+            as charts and media.
+    """
+
+    master_index: int
+    layout_index: int
+    elements: tuple
+    background: object | None
+    images: dict[str, bytes]
+    external: dict[str, tuple[str, str]]
+    unsupported: tuple[str, ...]
+
+
+class PresentationTemplate:
+    """Template presentation, loaded once, which new presentations are made from by cloning its slides.
+
+    The template is read and parsed once. New presentations start from the template without its slides, and so get
+    its slide size, masters, layouts and theme. Slides are made by copying the cached XML of a template slide, with
+    its static shapes and images, and filling its placeholders, instead of building each shape with python-pptx.
+
+    Use `PresentationTemplate.load` to share the template between presentations, per modification time of the file.
+
+    Attributes:
+        path (Path): Path to the template .pptx file.
+        slides (list[TemplateSlide]): Template slides, which can be cloned by index.
+    """
+
+    _relationship_namespace: ClassVar[str] = qn("r:id").removesuffix("id")
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        prs = Presentation(str(self.path))
+        layouts = {
+            layout.part: (master_index, layout_index)
+            for master_index, master in enumerate(prs.slide_masters)
+            for layout_index, layout in enumerate(master.slide_layouts)
+        }
+        self.slides = [self._template_slide(slide, *layouts[slide.slide_layout.part]) for slide in prs.slides]
+
+        slide_ids = prs.slides._sldIdLst
+        for slide_id in list(slide_ids):
+            slide_ids.remove(slide_id)
+            prs.part.drop_rel(slide_id.rId)
+        buffer = BytesIO()
+        prs.save(buffer)
+        self._blank = buffer.getvalue()
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PresentationTemplate":
+        """Template for a file, loaded once per process for each modification time and size of the file."""
+        path = Path(path)
+        stat = path.stat()
+        return cls._load(str(path.absolute()), stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    @lru_cache(maxsize=16)
+    def _load(cls, path: str, mtime_ns: int, size: int) -> "PresentationTemplate":
+        return cls(path)
+
+    @classmethod
+    def _relationship_references(cls, element) -> Iterator[tuple[object, str, str]]:
+        """Node, attribute and relationship id of every attribute in the relationships namespace, such as `r:embed`
+        of pictures, `r:id` of hyperlinks and charts, and `r:dm` of SmartArt."""
+        for node in element.iter():
+            for attribute, value in node.attrib.items():
+                if attribute.startswith(cls._relationship_namespace):
+                    yield node, attribute, value
+
+    @classmethod
+    def _template_slide(cls, slide: Slide, master_index: int, layout_index: int) -> TemplateSlide:
+        """Copy of the shapes of a slide, with the content of the parts they refer to."""
+        elements = tuple(copy.deepcopy(shape._element) for shape in slide.shapes)
+        background = slide._element.cSld.bg
+        background = copy.deepcopy(background) if background is not None else None
+
+        referenced = {
+            rId
+            for element in (*elements, *([background] if background is not None else []))
+            for _, _, rId in cls._relationship_references(element)
+        }
+        images, external, unsupported = {}, {}, set()
+        for rId in referenced:
+            relationship = slide.part.rels.get(rId)
+            if relationship is None:
+                unsupported.add(f"missing relationship '{rId}'")
+            elif relationship.is_external:
+                external[rId] = (relationship.reltype, relationship.target_ref)
+            elif relationship.reltype == RT.IMAGE:
+                images[rId] = relationship.target_part.blob
+            else:
+                unsupported.add(relationship.reltype)
+
+        return TemplateSlide(
+            master_index=master_index,
+            layout_index=layout_index,
+            elements=elements,
+            background=background,
+            images=images,
+            external=external,
+            unsupported=tuple(sorted(unsupported)),
+        )
+
+    def new_presentation(self) -> Presentation:
+        """New presentation with the slide size, masters and layouts of the template, and without slides."""
+        return Presentation(BytesIO(self._blank))
+
+    def clone_slide(self, prs: Presentation, index: int, placeholders: dict[int | str, str] | None = None) -> Slide:
+        """Add a copy of a template slide to a presentation made with `new_presentation`.
+
+        Arguments:
+            prs (Presentation): The presentation to add the slide to.
+            index (int): Index of the template slide.
+            placeholders (Optional[dict[int | str, str]]): Texts to fill in, see `fill`.
+
+        Returns:
+            Slide: The added slide.
+
+        Raises:
+            ValueError: If the index is out of range, or the slide refers to content which can not be cloned.
+        """
+        if index < 0 or index >= len(self.slides):
+            raise ValueError(f"Template slide index '{index}' out of range.")
+        template_slide = self.slides[index]
+        if template_slide.unsupported:
+            raise ValueError(
+                f"Template slide '{index}' refers to content which can not be cloned: {template_slide.unsupported}"
+            )
+
+        layout = prs.slide_masters[template_slide.master_index].slide_layouts[template_slide.layout_index]
+        slide = prs.slides.add_slide(layout)
+        shape_tree = slide.shapes._spTree
+        for shape in list(slide.shapes):
+            shape_tree.remove(shape._element)
+
+        relationship_ids = {
+            rId: slide.part.get_or_add_image_part(BytesIO(blob))[1] for rId, blob in template_slide.images.items()
+        }
+        for rId, (reltype, target) in template_slide.external.items():
+            relationship_ids[rId] = slide.part.relate_to(target, reltype, is_external=True)
+
+        def remapped(element):
+            clone = copy.deepcopy(element)
+            for node, attribute, rId in list(self._relationship_references(clone)):
+                node.set(attribute, relationship_ids[rId])
+            return clone
+
+        for element in template_slide.elements:
+            shape_tree.insert_element_before(remapped(element), "p:extLst")
+        if template_slide.background is not None:
+            slide._element.cSld.insert(0, remapped(template_slide.background))
+
+        if placeholders:
+            self.fill(slide, placeholders)
+        return slide
+
+    @staticmethod
+    def fill(slide: Slide, placeholders: dict[int | str, str]) -> None:
+        """Replace the text of shapes, by placeholder index for integer keys and by shape name for string keys.
+
+        Raises:
+            KeyError: If there is no placeholder or shape for a key.
+        """
+        shapes = {}
+        for shape in slide.shapes:
+            shapes.setdefault(shape.name, shape)
+            if shape.is_placeholder:
+                shapes.setdefault(shape.placeholder_format.idx, shape)
+        for key, text in placeholders.items():
+            if key not in shapes or not shapes[key].has_text_frame:
+                raise KeyError(f"No placeholder or text shape '{key}' on the slide.")
+            shapes[key].text_frame.text = text
+
+
 class PresentationSlideLink(SQLModel, table=True):
     presentation_id: int | None = Field(None, foreign_key="presentation.id", primary_key=True)
     slide_id: int | None = Field(None, foreign_key="slide.id", primary_key=True)
@@ -140,20 +494,27 @@ class SImage(SQLModel, table=True):
     push_to_layer: int | None = Field(default=None)
     slides: list["SSlide"] | None = Relationship(back_populates="images", link_model=SlideImageLink)
 
-    def add_to_slide(self, slide: Slide) -> Picture:
+    def add_to_slide(self, slide: Slide, assets: ImageAssetCache | None = None) -> Picture:
         """Add image to a slide.
 
+        Arguments:
+            slide (Slide): The slide to add the image to.
+            assets (Optional[ImageAssetCache]): Cache to read the image from. Defaults to the process wide
+                `image_assets` cache.
+
         Returns:
             Picture: The added picture object.
         """
         length_class = match_length_type_to_class(length_type_name=self.length_type)
-
-        img = slide.shapes.add_picture(
-            image_file=self.path,
+        width = length_class(self.width) if self.width else None
+        height = length_class(self.height) if self.height else None
+        img = (assets or image_assets).add_picture(
+            slide,
+            self.path,
             left=length_class(self.offset_left) if self.offset_left else 0,
             top=length_class(self.offset_top) if self.offset_top else 0,
-            width=length_class(self.width) if self.width else None,
-            height=length_class(self.height) if self.height else None,
+            width=width,
+            height=height,
         )
 
         if self.push_to_layer:
@@ -177,12 +538,21 @@ class SSlide(SQLModel, table=True):
         back_populates="slides", link_model=PresentationSlideLink
     )
 
-    def create(self, prs: Presentation) -> Slide:
-        if self.layout_index < 0 or self.layout_index >= len(prs.slide_layouts):
-            raise ValueError(f"Layout index '{self.layout_index}' out of range.")
+    def create(
+        self,
+        prs: Presentation,
+        template: Optional["PresentationTemplate"] = None,
+        template_slide_index: int | None = None,
+    ) -> Slide:
+        """Create the slide, as a clone of template slide `template_slide_index` when a template is given."""
+        if template is not None and template_slide_index is not None:
+            slide = template.clone_slide(prs, template_slide_index)
+        else:
+            if self.layout_index < 0 or self.layout_index >= len(prs.slide_layouts):
+                raise ValueError(f"Layout index '{self.layout_index}' out of range.")
 
-        slide_layout = prs.slide_layouts[self.layout_index]
-        slide = prs.slides.add_slide(slide_layout)
+            slide_layout = prs.slide_layouts[self.layout_index]
+            slide = prs.slides.add_slide(slide_layout)
 
         if self.title and slide.shapes.title:
             title = slide.shapes.title
@@ -213,6 +583,31 @@ class SSlide(SQLModel, table=True):
 
         return slide
 
+    def content_hash(self, template_slide_index: int | None = None) -> str:
+        """Fingerprint of everything the slide is rendered from: its row, images, text frames, texts and the template
+        slide it is cloned from.
+
+        The modification time and size of each image file are included, so that a replaced image file changes the
+        fingerprint as well.
+        """
+        images = []
+        for image in self.images:
+            stat = Path(image.path).stat()
+            images.append({**image.model_dump(exclude={"id"}), "file": [stat.st_mtime_ns, stat.st_size]})
+        content = {
+            "slide": self.model_dump(exclude={"id"}),
+            "template_slide_index": template_slide_index,
+            "images": images,
+            "textframes": [
+                {
+                    **textframe.model_dump(exclude={"id", "slide_id"}),
+                    "texts": [text.model_dump(exclude={"id", "textframe_id"}) for text in textframe.texts],
+                }
+                for textframe in self.textframes
+            ],
+        }
+        return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+
 
 class SPresentation(SQLModel, table=True):
     """
@@ -230,34 +625,372 @@ class SPresentation(SQLModel, table=True):
     output_dir: str | None = Field(None)
     slides: list[SSlide] | None = Relationship(back_populates="presentations", link_model=PresentationSlideLink)
 
+    @classmethod
+    def load(cls, session: Session, presentation_id: int) -> "SPresentation":
+        """Load a presentation with its slides, images, text frames and texts eagerly, see `PresentationLoader`.
+
+        Raises:
+            LookupError: If there is no presentation with the id.
+        """
+        return PresentationLoader(session=session).load(presentation_id)
+
+    def file_name(self) -> str:
+        """File name made from the presentation name."""
+        return self.file_name_for(self.name)
+
+    @staticmethod
+    def file_name_for(name: str) -> str:
+        """File name of a presentation with the name `name`."""
+        clean_name = re.sub(r"[^\x00-\x7F]+", "_", name)  # replace any non-ASCII character
+        clean_name = clean_name.replace("-", "_").replace(" ", "_")
+        return f"{clean_name.lower()}.pptx"
+
+    @staticmethod
+    def save(prs: Presentation, path: Path) -> Path:
+        """Save the presentation to a temporary file and move it into place, so that the file is never partial."""
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            prs.save(str(temporary_path))
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        return path
+
+    def _graph_is_loaded(self) -> bool:
+        """Whether the slides, and their images, text frames and texts, are all loaded, without loading any of them."""
+        if "slides" in inspect(self).unloaded:
+            return False
+        for slide in self.slides:
+            if inspect(slide).unloaded & {"images", "textframes"}:
+                return False
+            if any("texts" in inspect(textframe).unloaded for textframe in slide.textframes):
+                return False
+        return True
+
+    @staticmethod
+    def manifest_path(path: Path) -> Path:
+        """Path of the manifest with the slide fingerprints of an incrementally created presentation."""
+        return path.with_name(f"{path.name}.json")
+
+    @classmethod
+    def _previous_slides(cls, path: Path, settings: list) -> dict[str, int]:
+        """Index of each slide fingerprint in the previously created presentation at `path`.
+
+        Nothing is reused when there is no manifest, when the presentation was created with other settings, or when
+        the presentation file has been changed since the manifest was written.
+        """
+        try:
+            manifest = json.loads(cls.manifest_path(path).read_text(encoding="utf-8"))
+            stat = path.stat()
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("settings") != settings or manifest.get("file") != [stat.st_mtime_ns, stat.st_size]:
+            return {}
+        previous_slides = {}
+        for index, slide_hash in enumerate(manifest.get("slides", [])):
+            previous_slides.setdefault(slide_hash, index)
+        return previous_slides
+
+    @classmethod
+    def _write_manifest(cls, path: Path, settings: list, slide_hashes: list[str]) -> None:
+        """Write the manifest of a saved presentation to a temporary file and move it into place."""
+        stat = path.stat()
+        manifest = {"settings": settings, "file": [stat.st_mtime_ns, stat.st_size], "slides": slide_hashes}
+        manifest_path = cls.manifest_path(path)
+        temporary_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            temporary_path.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(temporary_path, manifest_path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
     def create(
         self,
         file_name: str | None = None,
         width: Length | None = None,
         height: Length | None = None,
+        output_dir: Path | None = None,
+        template: PresentationTemplate | None = None,
+        template_slides: Mapping[int, int] | None = None,
+        incremental: bool = False,
     ) -> Presentation:
-        """Create the presentation."""
+        """Create the presentation, save it in `output_dir` (default is the `output_dir` of the row) and return it.
+
+        A presentation which belongs to a session is loaded with `PresentationLoader` first, unless its whole graph is
+        already loaded, so that its slides and their content are read in a fixed number of queries instead of one
+        query per slide and text frame. This also holds when only the slides have been loaded before.
+
+        With a template, the presentation gets the slide size and layouts of the template, and the slides in
+        `template_slides`, a mapping from slide id to the index of a template slide, are cloned from the template
+        instead of being built shape by shape.
+
+        When `incremental` is set, a fingerprint of each slide is saved in a manifest next to the presentation, see
+        `manifest_path`. The next incremental create clones unchanged slides from the previously saved presentation,
+        and only renders the slides which are new, have changed or can not be cloned. A change of the size, the
+        template or `image_assets.max_dpi` renders all slides.
+        """
+        session = object_session(self)
+        if session is not None and self.id is not None and not self._graph_is_loaded():
+            PresentationLoader(session=session).load(self.id)
+
         widescreen_width = Inches(13.33)
         widescreen_height = Inches(7.5)
 
-        prs = Presentation()
+        template_slides = template_slides or {}
+        output_dir = Path(output_dir if output_dir is not None else self.output_dir or ".")
+        path = output_dir / (file_name or self.file_name())
+
+        previous, previous_slides, slide_hashes = None, {}, []
+        if incremental:
+            template_stat = template.path.stat() if template is not None else None
+            settings = [
+                width,
+                height,
+                str(template.path.absolute()) if template is not None else None,
+                [template_stat.st_mtime_ns, template_stat.st_size] if template_stat is not None else None,
+                image_assets.max_dpi,
+            ]
+            slide_hashes = [
+                slide.content_hash(template_slide_index=template_slides.get(slide.id)) for slide in self.slides
+            ]
+            previous_slides = self._previous_slides(path, settings)
+            if previous_slides:
+                previous = PresentationTemplate(path)
+
+        if previous is not None:
+            prs = previous.new_presentation()
+        else:
+            prs = template.new_presentation() if template is not None else Presentation()
+
+            if width or height:
+                prs.slide_width = width
+                prs.slide_height = height
+            elif template is None:
+                prs.slide_width = widescreen_width
+                prs.slide_height = widescreen_height
+
+        for slide, slide_hash in zip(self.slides, slide_hashes or [None] * len(self.slides)):
+            if slide_hash in previous_slides:
+                try:
+                    previous.clone_slide(prs, previous_slides[slide_hash])
+                    continue
+                except ValueError:  # content which can not be cloned, such as a chart, is rendered again
+                    pass
+            slide.create(prs=prs, template=template, template_slide_index=template_slides.get(slide.id))
+
+        self.save(prs, path)
+        if incremental:
+            self._write_manifest(path, settings, slide_hashes)
+        return prs
 
-        if width or height:
-            prs.slide_width = width
-            prs.slide_height = height
+
+class PresentationLoader:
+    """Loader of whole presentation graphs, with slides, images, text frames and texts, in five queries.
+
+    Relationships are loaded with `selectinload`, one query per level of the graph, however many slides and text
+    frames there are. Loaded presentations can be cached by id for the lifetime of the loader, which should not
+    outlive its session.
+
+    Arguments:
+        session (Session): Session to load presentations with.
+        cache (bool): Keep loaded presentations by id and return them without querying again. Defaults to False.
+    """
+
+    def __init__(self, session: Session, cache: bool = False):
+        self.session = session
+        self._presentations: dict[int, SPresentation] | None = {} if cache else None
+
+    @staticmethod
+    def statement(presentation_ids: Iterable[int]) -> SelectOfScalar:
+        """Query for presentations with their whole graph loaded eagerly."""
+        return (
+            select(SPresentation)
+            .where(SPresentation.id.in_(presentation_ids))
+            .options(
+                selectinload(SPresentation.slides).selectinload(SSlide.images),
+                selectinload(SPresentation.slides).selectinload(SSlide.textframes).selectinload(STextFrame.texts),
+            )
+        )
+
+    def load_many(self, presentation_ids: Iterable[int]) -> list[SPresentation]:
+        """Load presentations, in the order of the ids, with the same number of queries as for one presentation.
+
+        Raises:
+            LookupError: If a presentation does not exist.
+        """
+        presentation_ids = list(presentation_ids)
+        cached = self._presentations if self._presentations is not None else {}
+        missing_ids = [presentation_id for presentation_id in presentation_ids if presentation_id not in cached]
+        loaded = (
+            {presentation.id: presentation for presentation in self.session.exec(self.statement(missing_ids))}
+            if missing_ids
+            else {}
+        )
+        if self._presentations is not None:
+            self._presentations.update(loaded)
+
+        presentations = []
+        for presentation_id in presentation_ids:
+            presentation = cached.get(presentation_id) or loaded.get(presentation_id)
+            if presentation is None:
+                raise LookupError(f"Presentation with id '{presentation_id}' does not exist.")
+            presentations.append(presentation)
+        return presentations
+
+    def load(self, presentation_id: int) -> SPresentation:
+        """Load a presentation.
+
+        Raises:
+            LookupError: If the presentation does not exist.
+        """
+        return self.load_many([presentation_id])[0]
+
+    def invalidate(self, presentation_id: int | None = None) -> None:
+        """Drop a presentation, or all presentations, from the cache."""
+        if self._presentations is None:
+            return
+        if presentation_id is None:
+            self._presentations.clear()
         else:
-            prs.slide_width = widescreen_width
-            prs.slide_height = widescreen_height
+            self._presentations.pop(presentation_id, None)
+
+
+_worker_engine: Engine | None = None
+
+
+def _init_presentation_worker(database_url: str) -> None:
+    """Create the database engine of a worker process, which is shared by all presentations the worker builds."""
+    global _worker_engine
+    _worker_engine = create_engine(database_url)
+
+
+def _build_presentation(
+    presentation_id: int,
+    output_dir: Path,
+    template_path: Path | None = None,
+    template_slides: Mapping[int, int] | None = None,
+    incremental: bool = False,
+) -> PresentationBuildR:
+    """Build a presentation in a worker process, and report the error instead of raising it if the build fails."""
+    start = time.monotonic()
+    name = None
+    try:
+        template = PresentationTemplate.load(template_path) if template_path is not None else None
+        with Session(_worker_engine) as session:
+            presentation = SPresentation.load(session=session, presentation_id=presentation_id)
+            name = presentation.name
+            presentation.create(
+                output_dir=output_dir, template=template, template_slides=template_slides, incremental=incremental
+            )
+            path = output_dir / presentation.file_name()
+    except Exception as e:
+        return PresentationBuildR(
+            presentation_id=presentation_id,
+            name=name,
+            elapsed_seconds=time.monotonic() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    return PresentationBuildR(
+        presentation_id=presentation_id,
+        name=name,
+        path=path,
+        elapsed_seconds=time.monotonic() - start,
+    )
 
-        for slide in self.slides:
-            slide.create(prs=prs)
 
-        if not file_name:
-            clean_name = re.sub(r"[^\x00-\x7F]+", "_", self.name)  # replace any non-ASCII character
-            clean_name = clean_name.replace("-", "_").replace(" ", "_")
-            file_name = f"{clean_name.lower()}.pptx"
+def build_presentations(
+    database_url: str,
+    presentations: Iterable[int] | Select | SelectOfScalar,
+    output_dir: Path,
+    max_workers: int | None = None,
+    template_path: Path | None = None,
+    template_slides: Mapping[int, int] | None = None,
+    incremental: bool = False,
+) -> PresentationBatchR:
+    """Build a batch of presentations from the database in parallel worker processes.
+
+    Each worker creates its own database engine, loads each presentation eagerly and saves it atomically in
+    `output_dir`. A presentation which fails to build is reported with its error, and does not stop the batch.
+
+    Arguments:
+        database_url (str): Database URL, such as `sqlite:///data/database.db`, for the workers to connect to.
+        presentations (Iterable[int] | Select): Presentation ids, or a query selecting presentations or their ids.
+        output_dir (Path): Directory to save the presentations in, instead of their own `output_dir`.
+        max_workers (Optional[int]): Number of worker processes. Default is the number of processors, and `1` builds
+            the presentations in this process.
+        template_path (Optional[Path]): Template to create the presentations from, which each worker loads once, see
+            `PresentationTemplate`.
+        template_slides (Optional[Mapping[int, int]]): Index of the template slide to clone, by slide id, see
+            `SPresentation.create`.
+        incremental (bool): Only render the slides which have changed since the previous build of each presentation,
+            see `SPresentation.create`. Defaults to False.
+
+    Returns:
+        PresentationBatchR: Timing and outcome per presentation, in the order of the ids.
+
+    Raises:
+        ValueError: If presentations would be saved to the same file, because they are given more than once or their
+            names give the same file name, before any presentation is built.
+    """
+    global _worker_engine
+    start = time.monotonic()
+    engine = create_engine(database_url)
+    with Session(engine) as session:
+        if isinstance(presentations, (Select, SelectOfScalar)):
+            rows = session.exec(presentations).all()
+            presentation_ids = [row.id if isinstance(row, SPresentation) else row for row in rows]
+        else:
+            presentation_ids = list(presentations)
+        names = dict(
+            session.exec(
+                select(SPresentation.id, SPresentation.name).where(SPresentation.id.in_(set(presentation_ids)))
+            ).all()
+        )
+    engine.dispose()
+
+    presentations_by_file_name: dict[str, list[int]] = {}
+    for presentation_id in presentation_ids:
+        if presentation_id in names:
+            file_name = SPresentation.file_name_for(names[presentation_id])
+            presentations_by_file_name.setdefault(file_name, []).append(presentation_id)
+    duplicates = {file_name: ids for file_name, ids in presentations_by_file_name.items() if len(ids) > 1}
+    if duplicates:
+        raise ValueError(f"Presentations would overwrite each other, by file name: {duplicates}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if max_workers == 1:
+        _init_presentation_worker(database_url)
+        try:
+            built_presentations = [
+                _build_presentation(presentation_id, output_dir, template_path, template_slides, incremental)
+                for presentation_id in presentation_ids
+            ]
+        finally:
+            _worker_engine.dispose()
+            _worker_engine = None
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_presentation_worker, initargs=(database_url,)
+        ) as executor:
+            built_presentations = list(
+                executor.map(
+                    _build_presentation,
+                    presentation_ids,
+                    [output_dir] * len(presentation_ids),
+                    [template_path] * len(presentation_ids),
+                    [template_slides] * len(presentation_ids),
+                    [incremental] * len(presentation_ids),
+                )
+            )
 
-        prs.save(f"{self.output_dir}/{file_name}")
+    number_of_failed = sum(built.error is not None for built in built_presentations)
+    return PresentationBatchR(
+        output_dir=output_dir,
+        presentations=built_presentations,
+        number_of_built=len(built_presentations) - number_of_failed,
+        number_of_failed=number_of_failed,
+        elapsed_seconds=time.monotonic() - start,
+    )
 
 
 @dataclass
@@ -277,6 +1010,13 @@ class PowerPoint:
     widescreen_width: ClassVar[Inches] = Inches(13.33)
     widescreen_height: ClassVar[Inches] = Inches(7.5)
 
+    @classmethod
+    def from_template(cls, template: PresentationTemplate) -> "PowerPoint":
+        """PowerPoint with a new presentation made from a template, see `PresentationTemplate.clone_slide`."""
+        ppt = cls()
+        ppt.prs = template.new_presentation()
+        return ppt
+
     def add_slide(self, layout_index: int, title_text: str | None = None) -> Slide:
         """Add a PowerPoint slide with an optional title text.
 
@@ -325,7 +1065,7 @@ class PowerPoint:
         Returns:
             Picture: The added picture object.
         """
-        background_img = slide.shapes.add_picture(image_file, left, top, width, height)
+        background_img = image_assets.add_picture(slide, image_file, left, top, width, height)
         if move_to_background:
             slide.shapes._spTree.remove(background_img._element)
             slide.shapes._spTree.insert(2, background_img._element)
@@ -427,7 +1167,8 @@ class TitleSlide(SQLModel, table=True):
             date_p.alignment = PP_ALIGN.CENTER
             date_tf.vertical_anchor = MSO_ANCHOR.MIDDLE
         if self.logo:
-            slide.shapes.add_picture(
+            image_assets.add_picture(
+                slide,
                 self.logo,
                 left=Inches(11),
                 top=Inches(7),
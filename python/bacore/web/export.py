@@ -0,0 +1,121 @@
+"""Static site export of the BACore documentation.
+
+The home page and every documentation page are rendered to HTML files in an output directory, so that the
+documentation can be hosted by any web server without Python at request time. Each page is written to
+`<url>/index.html`, which makes the links of the app work with a rule such as `try_files $uri $uri/index.html` in
+nginx.
+
+Pages are rendered in parallel across a process pool. A manifest in the output directory keeps the fingerprint of the
+source file for each page, and only pages whose source has changed since the previous export are rendered again.
+
+# Usage:
+- `bacore export documentation site/`: Export the documentation to the directory `site/`, see `bacore.cli`.
+"""
+
+import json
+import os
+from bacore.domain.responses import ExportedSiteR
+from bacore.interfaces.fasthtml import common
+from bacore.web import main as web_main
+from bacore.web.main import Pages, headers, readme_file, src_docs
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+MANIFEST_FILE_NAME = ".bacore-export.json"
+LAYOUT_SOURCES = (Path(web_main.__file__), Path(common.__file__))
+
+
+def render_html(page) -> str:
+    """Render a page, as returned by `Pages`, to a complete HTML document with the app headers."""
+    return common.render_page(page, hdrs=headers)
+
+
+def page_file(output_dir: Path, site_url: str) -> Path:
+    """File for a site URL, such as `/` or `/docs/domain/files`."""
+    return output_dir / site_url.strip("/") / "index.html"
+
+
+def _fingerprint(path: Path) -> list[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _site_sources() -> dict[str, Path]:
+    """Source file for each site URL."""
+    sources = {"/": readme_file}
+    sources.update({f"/docs/{url}": module.path for url, module in src_docs.docs_tree().items()})
+    return sources
+
+
+def _write_atomic(file: Path, content: str) -> None:
+    file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = file.with_name(f".{file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(content, encoding="utf-8")
+    os.replace(tmp_file, file)
+
+
+def _render_pages(output_dir: Path, site_urls: list[str]) -> list[str]:
+    """Render and write pages. Runs in worker processes."""
+    for site_url in site_urls:
+        page = Pages.home() if site_url == "/" else Pages.docs(site_url.removeprefix("/docs/"))
+        _write_atomic(page_file(output_dir, site_url), render_html(page))
+    return site_urls
+
+
+def export_site(output_dir: Path, max_workers: Optional[int] = None, force: bool = False) -> ExportedSiteR:
+    """Export the home page and documentation pages as a static site.
+
+    Args:
+        `output_dir` (Path): Directory to write the site to.
+        `max_workers` (Optional[int]): Number of worker processes. Default is the number of CPUs and with `1` are the
+            pages rendered in the current process.
+        `force` (bool): Render all pages, also those with unchanged source. Default is `False`. Changes to the page
+            layout (`bacore.web.main` and `bacore.interfaces.fasthtml.common`) always render all pages.
+    """
+    manifest_file = output_dir / MANIFEST_FILE_NAME
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+
+    layout = [_fingerprint(source) for source in LAYOUT_SOURCES]
+    previous_pages = manifest.get("pages", {}) if manifest.get("layout") == layout and not force else {}
+    pages = {site_url: _fingerprint(source) for site_url, source in _site_sources().items()}
+
+    outdated_urls = [
+        site_url
+        for site_url, fingerprint in pages.items()
+        if previous_pages.get(site_url) != fingerprint or not page_file(output_dir, site_url).is_file()
+    ]
+
+    if max_workers == 1 or len(outdated_urls) <= 1:
+        _render_pages(output_dir, outdated_urls)
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(outdated_urls) // (workers * 4))
+        chunks = [outdated_urls[i : i + chunk_size] for i in range(0, len(outdated_urls), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_render_pages, repeat(output_dir), chunks))
+
+    removed_urls = [site_url for site_url in manifest.get("pages", {}) if site_url not in pages]
+    for site_url in removed_urls:
+        removed_file = page_file(output_dir, site_url)
+        removed_file.unlink(missing_ok=True)
+        for directory in removed_file.parents:
+            if directory == output_dir or output_dir not in directory.parents:
+                break
+            try:
+                directory.rmdir()
+            except OSError:  # Not empty, still holds other pages.
+                break
+
+    _write_atomic(manifest_file, json.dumps({"layout": layout, "pages": pages}, indent=2))
+
+    return ExportedSiteR(
+        output_dir=output_dir,
+        pages_written=outdated_urls,
+        pages_unchanged=len(pages) - len(outdated_urls),
+        pages_removed=removed_urls,
+    )
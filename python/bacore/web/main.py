@@ -11,6 +11,7 @@ from bacore.domain.source_code import DirectoryModel, ModuleModel
 from bacore.interfaces.fasthtml.common import (
     Documentation,
     MarkdownFT,
+    PageCache,
     doc_page,
     flexboxgrid,
 )
@@ -25,6 +26,7 @@ from fasthtml.common import (
     Li,
     MarkdownJS,
     Nav,
+    Request,
     Strong,
     Summary,
     Titled,
@@ -34,6 +36,7 @@ from fasthtml.common import (
 )
 from pathlib import Path
 
+src_docs = Documentation(path=Path("python/bacore"), package_root="bacore")
 tests_docs = Documentation(path=Path("tests"), package_root="tests")
 
 headers = (
@@ -43,6 +46,8 @@ headers = (
     picolink,
 )
 app = FastHTMLWithLiveReload(hdrs=headers)
+page_cache = PageCache()
+readme_file = Path("README.md")
 
 
 class NavTop:
@@ -118,6 +123,12 @@ class NavDocs(DirectoryModel):
                                         href="/docs/interactors/source-code-reader",
                                     )
                                 ),
+                                Li(
+                                    A(
+                                        "Testdata Writer",
+                                        href="/docs/interactors/testdata-writer",
+                                    )
+                                ),
                             ),
                         )
                     ),
@@ -172,38 +183,60 @@ class NavDocs(DirectoryModel):
         )
 
 
+class Pages:
+    """Page layouts, shared by the app routes and the static site export."""
+
+    @staticmethod
+    def home():
+        return Titled(
+            "BACore",
+            NavTop(),
+            MarkdownFT(path=readme_file, skip_title=True),
+        )
+
+    @staticmethod
+    def docs(path: str):
+        return Titled(
+            "Documentation",
+            NavTop(),
+            Div(
+                NavDocs(path=Path("python/bacore"), package_root="bacore"),
+                Div(doc_page(doc_source=src_docs, url=path), cls="col-xs-10"),
+                cls="row",
+            ),
+        )
+
+
 @app.get("/")
-def home():
-    return Titled(
-        "BACore",
-        NavTop(),
-        MarkdownFT(path=Path("README.md"), skip_title=True),
+def home(request: Request):
+    readme_stat = readme_file.stat()
+    return page_cache.respond(
+        request,
+        key="/",
+        fingerprint=(readme_stat.st_mtime_ns, readme_stat.st_size),
+        page=Pages.home,
     )
 
 
 @app.get("/docs/{path:path}")
-def docs(path: str):
-    return Titled(
-        "Documentation",
-        NavTop(),
-        Div(
-            NavDocs(path=Path("python/bacore"), package_root="bacore"),
-            Div(
-                doc_page(
-                    doc_source=Documentation(path=Path("python/bacore"), package_root="bacore"),
-                    url=path,
-                ),
-                cls="col-xs-10",
-            ),
-            cls="row",
-        ),
+def docs(request: Request, path: str):
+    return page_cache.respond(
+        request,
+        key=("/docs", path),
+        fingerprint=src_docs.fingerprint(path),
+        page=lambda: Pages.docs(path),
     )
 
 
 @app.route("/tests/{path:path}", methods="get")
-def tests(path: str):
+def tests(request: Request, path: str):
     """Test case pages."""
-    return doc_page(doc_source=tests_docs, url=path)
+    return page_cache.respond(
+        request,
+        key=("/tests", path),
+        fingerprint=tests_docs.fingerprint(path),
+        page=lambda: doc_page(doc_source=tests_docs, url=path),
+    )
 
 
 serve(port=7001)
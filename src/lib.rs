@@ -1,4 +1,14 @@
 use pyo3::prelude::*;
+use std::fs;
+use std::path::PathBuf;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::mpsc::{sync_channel, Receiver, SyncSender};
+use std::sync::{Arc, Condvar, Mutex};
+use std::thread;
+use std::time::UNIX_EPOCH;
+
+/// File path, size in bytes and modification time as seconds since the epoch.
+type FileRecord = (PathBuf, u64, f64);
 
 /// Formats the sum of two numbers as string.
 #[pyfunction]
@@ -6,9 +16,322 @@ fn sum_as_string(a: usize, b: usize) -> PyResult<String> {
     Ok((a + b).to_string())
 }
 
+/// Match a character against a `[...]` class at the start of the pattern.
+///
+/// Returns whether the character matched and the length of the class, or `None` if the class is not closed.
+fn match_class(pattern: &[char], c: char) -> Option<(bool, usize)> {
+    let mut i = 1;
+    let negate = pattern.get(i) == Some(&'!');
+    if negate {
+        i += 1;
+    }
+    let mut matched = false;
+    let mut first = true;
+    while i < pattern.len() {
+        if pattern[i] == ']' && !first {
+            return Some((matched != negate, i + 1));
+        }
+        if i + 2 < pattern.len() && pattern[i + 1] == '-' && pattern[i + 2] != ']' {
+            matched |= pattern[i] <= c && c <= pattern[i + 2];
+            i += 3;
+        } else {
+            matched |= pattern[i] == c;
+            i += 1;
+        }
+        first = false;
+    }
+    None
+}
+
+/// Match a file name against a shell pattern, with the same rules as Python's `fnmatch`.
+fn wildcard_match(pattern: &[char], name: &[char]) -> bool {
+    let (mut p, mut n) = (0, 0);
+    let mut backtrack: Option<(usize, usize)> = None;
+
+    while n < name.len() {
+        if p < pattern.len() {
+            match pattern[p] {
+                '*' => {
+                    backtrack = Some((p, n));
+                    p += 1;
+                    continue;
+                }
+                '?' => {
+                    p += 1;
+                    n += 1;
+                    continue;
+                }
+                '[' => match match_class(&pattern[p..], name[n]) {
+                    Some((true, length)) => {
+                        p += length;
+                        n += 1;
+                        continue;
+                    }
+                    Some((false, _)) => {}
+                    None if name[n] == '[' => {
+                        p += 1;
+                        n += 1;
+                        continue;
+                    }
+                    None => {}
+                },
+                c if c == name[n] => {
+                    p += 1;
+                    n += 1;
+                    continue;
+                }
+                _ => {}
+            }
+        }
+        match backtrack {
+            Some((star_p, star_n)) => {
+                p = star_p + 1;
+                n = star_n + 1;
+                backtrack = Some((star_p, star_n + 1));
+            }
+            None => return false,
+        }
+    }
+
+    pattern[p..].iter().all(|&c| c == '*')
+}
+
+fn normalize_case(text: &str) -> Vec<char> {
+    if cfg!(windows) {
+        text.to_lowercase().chars().collect()
+    } else {
+        text.chars().collect()
+    }
+}
+
+struct WalkOptions {
+    pattern: Vec<char>,
+    recursive: bool,
+    modified_before: Option<f64>,
+    min_size: Option<u64>,
+    max_size: Option<u64>,
+    batch_size: usize,
+}
+
+impl WalkOptions {
+    fn accepts(&self, size: u64, mtime: f64) -> bool {
+        self.modified_before.map_or(true, |before| mtime < before)
+            && self.min_size.map_or(true, |min_size| size >= min_size)
+            && self.max_size.map_or(true, |max_size| size <= max_size)
+    }
+}
+
+/// Directories waiting to be read and the number of directories being read.
+struct WalkQueue {
+    directories: Vec<PathBuf>,
+    active: usize,
+}
+
+struct WalkState {
+    queue: Mutex<WalkQueue>,
+    changed: Condvar,
+    cancelled: AtomicBool,
+}
+
+impl WalkState {
+    /// Next directory to read, or `None` when all directories are read or the walk is cancelled.
+    fn next_directory(&self) -> Option<PathBuf> {
+        let mut queue = self.queue.lock().unwrap();
+        loop {
+            if self.cancelled.load(Ordering::Relaxed) {
+                return None;
+            }
+            if let Some(directory) = queue.directories.pop() {
+                queue.active += 1;
+                return Some(directory);
+            }
+            if queue.active == 0 {
+                self.changed.notify_all();
+                return None;
+            }
+            queue = self.changed.wait(queue).unwrap();
+        }
+    }
+
+    fn finish_directory(&self, subdirectories: Vec<PathBuf>) {
+        let mut queue = self.queue.lock().unwrap();
+        queue.directories.extend(subdirectories);
+        queue.active -= 1;
+        self.changed.notify_all();
+    }
+
+    fn cancel(&self) {
+        self.cancelled.store(true, Ordering::Relaxed);
+        let _queue = self.queue.lock().unwrap();
+        self.changed.notify_all();
+    }
+}
+
+fn file_record(entry: &fs::DirEntry, options: &WalkOptions) -> Option<FileRecord> {
+    let name = entry.file_name();
+    if !wildcard_match(&options.pattern, &normalize_case(&name.to_string_lossy())) {
+        return None;
+    }
+    // Follows symbolic links, in the same way as `Path.is_file()`.
+    let metadata = fs::metadata(entry.path()).ok()?;
+    if !metadata.is_file() {
+        return None;
+    }
+    let mtime = match metadata.modified().ok()?.duration_since(UNIX_EPOCH) {
+        Ok(duration) => duration.as_secs_f64(),
+        Err(error) => -error.duration().as_secs_f64(),
+    };
+    options
+        .accepts(metadata.len(), mtime)
+        .then(|| (entry.path(), metadata.len(), mtime))
+}
+
+fn walk(state: Arc<WalkState>, options: Arc<WalkOptions>, sender: SyncSender<Vec<FileRecord>>) {
+    let mut batch = Vec::with_capacity(options.batch_size);
+
+    while let Some(directory) = state.next_directory() {
+        let mut subdirectories = Vec::new();
+        if let Ok(entries) = fs::read_dir(&directory) {
+            for entry in entries.flatten() {
+                let Ok(file_type) = entry.file_type() else {
+                    continue;
+                };
+                // Symbolic links to directories are not followed.
+                if file_type.is_dir() {
+                    if options.recursive {
+                        subdirectories.push(entry.path());
+                    }
+                } else if let Some(record) = file_record(&entry, &options) {
+                    batch.push(record);
+                    if batch.len() >= options.batch_size {
+                        let full_batch = std::mem::replace(&mut batch, Vec::with_capacity(options.batch_size));
+                        if sender.send(full_batch).is_err() {
+                            state.cancel();
+                        }
+                    }
+                }
+            }
+        }
+        state.finish_directory(subdirectories);
+    }
+
+    if !batch.is_empty() {
+        let _ = sender.send(batch);
+    }
+}
+
+/// Walk a directory on background threads and iterate over batches of matching files.
+///
+/// Each batch is a list of `(path, size, mtime)` tuples. The walk runs without holding the GIL, in parallel over
+/// subdirectories, and the order of files is therefore unspecified. Symbolic links to directories are not followed.
+///
+/// Arguments:
+///     root: Directory to walk.
+///     pattern: Shell pattern, as for `fnmatch`, to match file names against.
+///     recursive: Whether to walk subdirectories.
+///     modified_before: Only include files modified before this time, as seconds since the epoch.
+///     min_size: Only include files of at least this size in bytes.
+///     max_size: Only include files of at most this size in bytes.
+///     batch_size: Number of files in each batch.
+///     threads: Number of walker threads, where `0` uses the available parallelism.
+#[pyclass(module = "bacore._bacore")]
+struct FileWalker {
+    receiver: Mutex<Receiver<Vec<FileRecord>>>,
+    state: Arc<WalkState>,
+}
+
+#[pymethods]
+impl FileWalker {
+    #[new]
+    #[pyo3(signature = (root, pattern="*", recursive=true, modified_before=None, min_size=None, max_size=None, batch_size=1024, threads=0))]
+    #[allow(clippy::too_many_arguments)]
+    fn new(
+        root: PathBuf,
+        pattern: &str,
+        recursive: bool,
+        modified_before: Option<f64>,
+        min_size: Option<u64>,
+        max_size: Option<u64>,
+        batch_size: usize,
+        threads: usize,
+    ) -> Self {
+        let threads = match threads {
+            0 => thread::available_parallelism().map_or(4, |parallelism| parallelism.get()),
+            threads => threads,
+        };
+        let options = Arc::new(WalkOptions {
+            pattern: normalize_case(pattern),
+            recursive,
+            modified_before,
+            min_size,
+            max_size,
+            batch_size: batch_size.max(1),
+        });
+        let state = Arc::new(WalkState {
+            queue: Mutex::new(WalkQueue {
+                directories: vec![root],
+                active: 0,
+            }),
+            changed: Condvar::new(),
+            cancelled: AtomicBool::new(false),
+        });
+        let (sender, receiver) = sync_channel(threads * 2);
+
+        for _ in 0..threads {
+            let (state, options, sender) = (Arc::clone(&state), Arc::clone(&options), sender.clone());
+            thread::spawn(move || walk(state, options, sender));
+        }
+
+        FileWalker {
+            receiver: Mutex::new(receiver),
+            state,
+        }
+    }
+
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&self, py: Python<'_>) -> Option<Vec<FileRecord>> {
+        py.allow_threads(|| self.receiver.lock().unwrap().recv().ok())
+    }
+}
+
+impl Drop for FileWalker {
+    fn drop(&mut self) {
+        self.state.cancel();
+    }
+}
+
 /// A Python module implemented in Rust.
 #[pymodule]
 fn _bacore(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(sum_as_string, m)?)?;
+    m.add_class::<FileWalker>()?;
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::wildcard_match;
+
+    fn matches(pattern: &str, name: &str) -> bool {
+        let pattern: Vec<char> = pattern.chars().collect();
+        let name: Vec<char> = name.chars().collect();
+        wildcard_match(&pattern, &name)
+    }
+
+    #[test]
+    fn test_wildcard_match() {
+        assert!(matches("*", "file.log"));
+        assert!(matches("*.log", "file.log"));
+        assert!(!matches("*.log", "file.txt"));
+        assert!(matches("file?.log", "file1.log"));
+        assert!(matches("file[0-9].log", "file7.log"));
+        assert!(!matches("file[!0-9].log", "file7.log"));
+        assert!(matches("*a*b*", "xxaxxbxx"));
+        assert!(!matches("*a*b", "xxaxxbxx"));
+        assert!(matches("[[]*", "[name"));
+        assert!(matches("[]]", "]"));
+    }
+}
@@ -43,6 +43,67 @@ def test_markdown_file_without_title(fixt_dir_with_files):
     )
 
 
+def test_markdown_file_chunks(fixt_dir_with_files):
+    readme_file = MarkdownFile(path=fixt_dir_with_files / "readme.md", skip_title=True)
+    chunks = list(readme_file.iter_chunks(chunk_size=16))
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert "".join(chunks) == readme_file.read()
+
+
+def test_markdown_file_chunks_of_long_lines(tmp_path):
+    report_file = tmp_path / "report.md"
+    report_file.write_text(f"# {'Title ' * 10}\n\n{'Body ' * 10}\n")
+    chunks = list(MarkdownFile(path=report_file, skip_title=False).iter_chunks(chunk_size=16))
+    assert all(len(chunk) <= 16 for chunk in chunks)
+    assert "".join(chunks) == report_file.read_text()
+    assert "".join(MarkdownFile(path=report_file, skip_title=True).iter_chunks(chunk_size=16)) == f"{'Body ' * 10}\n"
+
+
+def test_markdown_file_front_matter(tmp_path):
+    report_file = tmp_path / "report.md"
+    report_file.write_text('+++\ntitle = "Report"\n+++\n# Report\n\nBody.\n')
+    assert MarkdownFile(path=report_file, skip_title=False).read() == report_file.read_text()
+    markdown_file = MarkdownFile(path=report_file, skip_title=True, skip_front_matter=True)
+    assert markdown_file.front_matter() == {"title": "Report"}
+    assert markdown_file.read() == "Body.\n"
+
+
+def test_markdown_file_section(tmp_path):
+    report_file = tmp_path / "report.md"
+    report_file.write_text(
+        "# Report\n\n## Summary\n\nAll good.\n\n```python\n# Not a heading\n```\n\n### Details\n\nMore.\n\n## Next\n"
+    )
+    markdown_file = MarkdownFile(path=report_file, skip_title=False)
+    assert [heading.title for heading in markdown_file.headings()] == ["Report", "Summary", "Details", "Next"]
+    assert markdown_file.section("Summary") == (
+        "## Summary\n\nAll good.\n\n```python\n# Not a heading\n```\n\n### Details\n\nMore.\n\n"
+    )
+    assert markdown_file.section("Next") == "## Next\n"
+    with pytest.raises(ValueError):
+        markdown_file.section("Missing")
+
+
+def test_markdown_file_headings_skip_front_matter_and_fences(tmp_path):
+    report_file = tmp_path / "report.md"
+    report_file.write_text(
+        "+++\n# Comment in front matter\ntitle = 'Report'\n+++\n# Report\n\n"
+        "````markdown\n```\n# Not a heading\n````\n\n## Summary\n"
+    )
+    markdown_file = MarkdownFile(path=report_file, skip_title=False)
+    assert [heading.title for heading in markdown_file.headings()] == ["Report", "Summary"]
+    assert markdown_file.section("Report").startswith("# Report\n")
+
+
+def test_markdown_file_unclosed_front_matter(tmp_path, monkeypatch):
+    monkeypatch.setattr(MarkdownFile, "front_matter_max_size", 16)
+    report_file = tmp_path / "report.md"
+    report_file.write_text("---\ntitle: Report\n# Report\n\nBody.\n---\n")
+    markdown_file = MarkdownFile(path=report_file, skip_title=False, skip_front_matter=True)
+    assert markdown_file.front_matter() == {}
+    assert markdown_file.read() == report_file.read_text()
+    assert [heading.title for heading in markdown_file.headings()] == ["Report"]
+
+
 class TestTOMLFile:
     """Tests for TOML entity."""
 
@@ -55,3 +116,22 @@ class TestTOMLFile:
         """Test toml_file_content."""
         content = TOMLFile(path=fixt_dir_with_files / "pyproject.toml")
         assert isinstance(content.data_to_dict(), dict)
+
+    def test_data_to_dict_is_cached(self, fixt_dir_with_files):
+        """Test that an unchanged file is parsed once and a changed file is parsed again."""
+        toml_file = TOMLFile(path=fixt_dir_with_files / "pyproject.toml")
+        content = toml_file.data_to_dict()
+        content["project"]["name"] = "changed"
+        hits = TOMLFile._parse.cache_info().hits
+        assert toml_file.data_to_dict()["project"]["name"] == "bacore"
+        assert TOMLFile._parse.cache_info().hits == hits + 1
+
+        toml_file.path.write_text('[project]\nname = "edited"\n')
+        assert toml_file.data_to_dict()["project"]["name"] == "edited"
+
+    def test_data_to_dict_invalid(self, tmp_path):
+        """Test that invalid TOML raises a value error."""
+        toml_file = tmp_path / "invalid.toml"
+        toml_file.write_text("[project")
+        with pytest.raises(ValueError):
+            TOMLFile(path=toml_file).data_to_dict()
@@ -38,6 +38,12 @@ class TestProject:
         with pytest.raises(ValueError):
             settings.Project(name="ba core")
 
+    def test_project_is_immutable(self):
+        """Test that project information can not be changed."""
+        p = settings.Project(name="bacore")
+        with pytest.raises(ValueError):
+            p.name = "changed"
+
 
 class TestProjectSettings:
     """Tests for ProjectSettings entity."""
@@ -61,6 +67,33 @@ class TestProjectSettings:
             == "BACore is a framework for business analysis and test automation."
         )
 
+    def test_project_settings_snapshot(self, fixt_dir_with_files):
+        """Test that the project information is read once, until reloaded."""
+        project_settings = settings.ProjectSettings(project_root_dir=fixt_dir_with_files)
+        assert project_settings.name == "bacore"
+        (fixt_dir_with_files / "pyproject.toml").write_text('[project]\nname = "edited"\n')
+        assert project_settings.name == "bacore"
+        assert project_settings.reload().name == "edited"
+        assert project_settings.version == "No project version set."
+
+    def test_project_settings_auto_reload(self, fixt_dir_with_files):
+        """Test that the project information is read again when pyproject.toml changes."""
+        project_settings = settings.ProjectSettings(project_root_dir=fixt_dir_with_files, auto_reload=True)
+        assert project_settings.name == "bacore"
+        (fixt_dir_with_files / "pyproject.toml").write_text('[project]\nname = "edited"\n')
+        assert project_settings.name == "edited"
+
+    def test_project_settings_source(self):
+        """Test project information from any source which supports retrieving a dict."""
+
+        class ProjectSource:
+            def data_to_dict(self) -> dict:
+                return {"project": {"name": "bacore", "version": "2.0.0"}}
+
+        project_settings = settings.ProjectSettings(source=ProjectSource())
+        assert project_settings.version == "2.0.0"
+        assert project_settings.description == "No project description given."
+
 
 class TestSecret:
     """Tests for SecretStr."""
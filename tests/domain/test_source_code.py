@@ -5,7 +5,11 @@ from bacore.domain.source_code import (
     ClassModel,
     DirectoryModel,
     FunctionModel,
+    ModuleEntry,
     ModuleModel,
+    SourceIndex,
+    StaticClassModel,
+    StaticFunctionModel,
 )
 from pathlib import Path
 from random import choice
@@ -30,6 +34,26 @@ class TestDirectoryModel:
         directory = choice(self.src_dir.directories)
         assert isinstance(directory, DirectoryModel), f"should be of type DirectoryModel, not {directory}"
 
+    def test_iter_modules(self):
+        module_entries = self.src_dir.iter_modules()
+        assert not isinstance(module_entries, list)
+        module_entry = next(module_entries)
+        assert isinstance(module_entry, ModuleEntry)
+        assert module_entry.model() == self.src_dir.modules[0]
+
+    def test_iter_modules_not_recursive(self):
+        module_paths = [module_entry.path for module_entry in self.src_dir.iter_modules(recursive=False)]
+        assert module_paths == [module.path for module in self.src_dir.modules]
+
+    def test_iter_modules_include_exclude(self):
+        module_paths = [
+            module_entry.path.as_posix()
+            for module_entry in self.src_dir.iter_modules(include=["domain/*"], exclude=["domain/s*"])
+        ]
+        assert "python/bacore/domain/files.py" in module_paths
+        assert "python/bacore/domain/settings.py" not in module_paths
+        assert all(module_path.startswith("python/bacore/domain/") for module_path in module_paths)
+
 
 class TestModuleModel:
     init_module = ModuleModel(path=Path("python/bacore/__init__.py"), package_root="bacore")
@@ -96,6 +120,10 @@ class TestSrcClass:
     def test_functions(self):
         assert len(self.source_code_model.functions()) != 0, self.source_code_model.functions()
 
+    def test_functions_are_memoized(self):
+        assert self.source_code_model.functions() == self.source_code_model.functions()
+        assert self.source_code_model.functions()[0] is ClassModel(klass=ClassModel).functions()[0]
+
     @pytest.mark.skip("Need to implement a recursive function for finding sub-classes.")
     def test_classes(self):
         assert len(self.source_code_model.classes()) != 0, self.source_code_model.classes()
@@ -114,3 +142,60 @@ class TestSrcFunc:
 
     def test_doc(self):
         assert self.function_model.doc.splitlines()[0] == "Delete files older than x days."
+
+
+class TestSourceIndex:
+    web_main_path = Path("python/bacore/web/main.py")
+
+    def test_static_module(self):
+        web_main_module = ModuleModel(path=self.web_main_path, package_root="bacore", index=SourceIndex())
+        assert web_main_module.doc.splitlines()[0] == "BACore documentation with FastHTML."
+        assert [func.name for func in web_main_module.functions()] == ["docs", "home", "tests"]
+        assert all(isinstance(klass, StaticClassModel) for klass in web_main_module.classes())
+
+    def test_static_class_members(self):
+        source_code_module = ModuleModel(
+            path=Path("python/bacore/domain/source_code.py"), package_root="bacore", index=SourceIndex()
+        )
+        class_model = source_code_module.classes()[0]
+        assert class_model.name == "ClassModel"
+        assert class_model.doc == "Python class model."
+        assert {"classes", "functions"} <= {func.name for func in class_model.functions()}
+        assert all(isinstance(func, StaticFunctionModel) for func in class_model.functions())
+
+    def test_directory_passes_index_on(self):
+        index = SourceIndex()
+        src_dir = DirectoryModel(path=Path("python/bacore"), package_root="bacore", index=index)
+        assert all(module.index is index for module in src_dir.modules)
+        assert all(directory.index is index for directory in src_dir.directories)
+
+    def test_reparse_only_changed_files(self, tmp_path):
+        module_file = tmp_path / "module.py"
+        module_file.write_text('"""First docstring."""', encoding="utf-8")
+        index_file = tmp_path / "index.json"
+
+        index = SourceIndex(index_file=index_file)
+        first_summary = index.summary(module_file)
+        assert index.summary(module_file) is first_summary
+        index.save()
+
+        reloaded_index = SourceIndex(index_file=index_file)
+        assert reloaded_index.summary(module_file).doc == "First docstring."
+
+        module_file.write_text('"""Second, and longer, docstring."""', encoding="utf-8")
+        assert reloaded_index.summary(module_file).doc == "Second, and longer, docstring."
+
+    def test_prune(self, tmp_path):
+        module_file = tmp_path / "module.py"
+        module_file.write_text('"""Docstring."""', encoding="utf-8")
+        index = SourceIndex()
+        index.summary(module_file)
+        module_file.unlink()
+        assert index.prune() == 1
+        assert len(index) == 0
+
+    def test_syntax_error(self, tmp_path):
+        module_file = tmp_path / "module.py"
+        module_file.write_text("def broken(:", encoding="utf-8")
+        with pytest.raises(ValueError):
+            SourceIndex().summary(module_file)
@@ -0,0 +1,134 @@
+"""Tests for domain.testdata module."""
+
+import pytest
+from bacore.domain import testdata
+from hypothesis import given, strategies as st
+
+pytestmark = pytest.mark.domain
+
+
+@pytest.fixture
+def fixt_reseed_shared_faker():
+    """Reseed the shared Faker instances from system randomness after the test, so that seeds do not leak."""
+    yield
+    testdata.FakerData.reseed_shared()
+
+
+@pytest.fixture(scope="class")
+def fixt_pooled_test_data():
+    """Test data with strategies backed by pools of 20 values, which are built when the fixture is first used."""
+    return testdata.TestData(country_or_region="sweden", strategy_pool_size=20)
+
+
+class TestFakerData:
+    """Tests for shared Faker instances."""
+
+    def test_shared(self):
+        assert testdata.FakerData.shared("sweden") is testdata.FakerData.shared("sweden")
+        assert testdata.FakerData.shared("sweden") is not testdata.FakerData.shared("nordics")
+        assert testdata.FakerData.shared("sweden") is not testdata.FakerData.shared("sweden", True)
+
+    def test_reseed(self, fixt_reseed_shared_faker):
+        test_data = testdata.TestData(country_or_region="sweden")
+        test_data.reseed(3)
+        names = [test_data.first_name() for _ in range(5)]
+        testdata.FakerData.reseed_shared(3)
+        assert [testdata.TestData(country_or_region="sweden").first_name() for _ in range(5)] == names
+
+
+class TestGenerate:
+    """Tests for bulk generation of test data."""
+
+    test_data = testdata.TestData(country_or_region="sweden")
+
+    def test_generate(self):
+        rows = self.test_data.generate(1000, fields=["first_name", "ssn"], pool_size=10, seed=1)
+        assert [len(column) for column in rows.values()] == [1000, 1000]
+        assert set(rows["ssn"]) <= set(self.test_data.pool("ssn", pool_size=10, seed=1))
+
+    def test_generate_is_reproducible(self):
+        assert self.test_data.generate(10, fields=["company"], seed=1) == testdata.TestData("sweden").generate(
+            10, fields=["company"], seed=1
+        )
+
+    def test_generate_without_pools(self):
+        rows = self.test_data.generate(3, fields=["last_name"], pool_size=None)
+        assert len(rows["last_name"]) == 3
+
+    def test_iter_batches(self):
+        batches = list(self.test_data.iter_batches(25, fields=["first_name"], batch_size=10))
+        assert [len(batch["first_name"]) for batch in batches] == [10, 10, 5]
+
+    def test_generate_in_parallel(self):
+        """Rows are the same for any number of workers."""
+        parallel_batches = self.test_data.iter_batches(
+            30, fields=["first_name", "ssn"], batch_size=7, pool_size=None, seed=2, max_workers=2
+        )
+        sequential_batches = self.test_data.iter_batches(
+            30, fields=["first_name", "ssn"], batch_size=7, pool_size=None, seed=2
+        )
+        assert list(parallel_batches) == list(sequential_batches)
+
+    def test_seed_does_not_change_shared_faker(self):
+        shared_faker = testdata.FakerData.shared("sweden")
+        test_data = testdata.TestData(country_or_region="sweden")
+        state = shared_faker.random.getstate()
+        test_data.generate(5, fields=["first_name"], pool_size=None, seed=1)
+        test_data.pool("last_name", pool_size=5, seed=1)
+        assert shared_faker.random.getstate() == state
+        assert test_data.faker_data is not shared_faker
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            self.test_data.generate(1, fields=["password"])
+
+
+class TestISINGenerator:
+    """Tests for ISIN codes."""
+
+    isin_generator = testdata.ISINGenerator(testdata.CountryCodes.world())
+
+    @pytest.mark.parametrize("isin", ["US0378331005", "SE0000108656", "GB00B03MLX29", "AU0000XVGZA3"])
+    def test_check_digit(self, isin):
+        assert testdata.ISINGenerator.check_digit(isin[:11]) == isin[11]
+        assert testdata.ISINGenerator.is_valid(isin)
+
+    def test_generate(self):
+        codes = self.isin_generator.generate(1000)
+        assert all(testdata.ISINGenerator.is_valid(code) for code in codes)
+        assert {code[:2] for code in codes} <= set(self.isin_generator.countries)
+
+    @given(isin_generator.strategy())
+    def test_strategy(self, isin):
+        assert testdata.ISINGenerator.is_valid(isin)
+
+    def test_test_data_isin(self):
+        isin = testdata.TestData(country_or_region="norway").isin()
+        assert isin.startswith("NO")
+        assert testdata.ISINGenerator.is_valid(isin)
+
+
+class TestStrategyPools:
+    """Tests for hypothesis strategies backed by pools of values."""
+
+    @given(data=st.data())
+    def test_strategy_values_are_from_pool(self, fixt_pooled_test_data, data):
+        first_name = data.draw(fixt_pooled_test_data.first_name_st())
+        assert first_name in fixt_pooled_test_data.pool("first_name", pool_size=20, seed=0)
+
+    def test_seeded_pool_is_shared_by_process(self):
+        pool = testdata.TestData(country_or_region="sweden").pool("company", pool_size=7, seed=3)
+        test_data = testdata.TestData(country_or_region="sweden")
+        assert test_data.pool("company", pool_size=7, seed=3) is pool
+        assert test_data.faker_data is testdata.FakerData.shared("sweden")
+        assert testdata.TestData(country_or_region="norway").pool("company", pool_size=7, seed=3) is not pool
+        assert test_data.pool("company", pool_size=7) is not test_data.pool("company", pool_size=7, seed=3)
+
+    def test_pool_is_saved(self, tmp_path):
+        test_data = testdata.TestData(country_or_region="sweden", strategy_pool_size=5, pool_dir=tmp_path)
+        pool = test_data.pool("ssn", pool_size=5, seed=0)
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        reloaded_test_data = testdata.TestData(country_or_region="sweden", pool_dir=tmp_path)
+        reloaded_test_data.reseed(1)
+        assert reloaded_test_data.pool("ssn", pool_size=5, seed=0) == pool
@@ -1,7 +1,19 @@
 """File handler tests."""
 
+import os
 import pytest
-from bacore.interactors.file_handler import delete_files, get_files_in_dir
+from bacore.interactors import file_handler
+from bacore.interactors.file_handler import (
+    delete_files,
+    file_digest,
+    find_duplicate_files,
+    get_files_in_dir,
+    iter_files_in_dir,
+    mirror_files,
+    plan_file_deletion,
+    rsync_copy,
+)
+from pathlib import Path
 
 pytestmark = pytest.mark.interactors
 
@@ -12,8 +24,8 @@ def test_delete_files(fixt_dir_with_files):
     assert deleted_files == [
         "pyproject.toml",
         "readme.md",
-        "python_src_file.py",
         "__init__.py",
+        "python_src_file.py",
     ]
 
 
@@ -24,6 +36,154 @@ def test_get_files_in_dir(fixt_dir_with_files):
     assert file_names == [
         "pyproject.toml",
         "readme.md",
-        "python_src_file.py",
         "__init__.py",
+        "python_src_file.py",
+    ]
+
+
+def test_iter_files_in_dir(fixt_dir_with_files):
+    files = list(iter_files_in_dir(directory=fixt_dir_with_files, recursive=True))
+    files_in_dir = get_files_in_dir(directory=fixt_dir_with_files, recursive=True)
+    assert sorted(file.path for file in files) == files_in_dir
+    assert all(file.size == file.path.stat().st_size for file in files)
+
+
+def test_iter_files_in_dir_pattern(fixt_dir_with_files):
+    files = iter_files_in_dir(directory=fixt_dir_with_files, recursive=True, pattern="*.py")
+    assert sorted(file.path.name for file in files) == ["__init__.py", "python_src_file.py"]
+
+
+@pytest.mark.parametrize("pattern, recursive", [("*", True), ("*.py", True), ("*", False)])
+def test_file_walker(fixt_dir_with_files, monkeypatch, pattern, recursive):
+    """The native walk of the `_bacore` extension finds the same files as the `os.scandir` walk."""
+    _bacore = pytest.importorskip("bacore._bacore")
+    walker = _bacore.FileWalker(str(fixt_dir_with_files), pattern=pattern, recursive=recursive, batch_size=2)
+    native_files = sorted((Path(file_path), size, mtime) for batch in walker for file_path, size, mtime in batch)
+    monkeypatch.setattr(file_handler, "FileWalker", None)
+    files = iter_files_in_dir(directory=fixt_dir_with_files, recursive=recursive, pattern=pattern)
+    scanned_files = sorted((file.path, file.size, file.mtime) for file in files)
+    assert [file[:2] for file in native_files] == [file[:2] for file in scanned_files]
+    assert [file[2] for file in native_files] == pytest.approx([file[2] for file in scanned_files])
+
+
+def test_iter_files_in_dir_filters(fixt_dir_with_files):
+    sizes = {file.path: file.size for file in iter_files_in_dir(directory=fixt_dir_with_files, recursive=True)}
+    smallest, largest = min(sizes.values()), max(sizes.values())
+    files = iter_files_in_dir(directory=fixt_dir_with_files, recursive=True, min_size=smallest + 1, max_size=largest)
+    assert {file.path for file in files} == {path for path, size in sizes.items() if size > smallest}
+    assert list(iter_files_in_dir(directory=fixt_dir_with_files, recursive=True, modified_before=0)) == []
+
+
+def test_delete_files_streaming(fixt_dir_with_files):
+    progress_reports = []
+    deleted_files_response = delete_files(
+        path=fixt_dir_with_files,
+        recursive=True,
+        max_workers=4,
+        max_recorded_files=1,
+        progress=lambda deleted, freed: progress_reports.append((deleted, freed)),
+    )
+    assert deleted_files_response.number_of_deleted_files == 4
+    assert len(deleted_files_response.deleted_files) == 1
+    assert deleted_files_response.deleted_files_truncated is True
+    assert deleted_files_response.bytes_freed > 0
+    assert progress_reports[-1] == (4, deleted_files_response.bytes_freed)
+    assert list(iter_files_in_dir(directory=fixt_dir_with_files, recursive=True)) == []
+
+
+def test_plan_file_deletion(fixt_dir_with_files):
+    deletion_plan = plan_file_deletion(path=fixt_dir_with_files, recursive=True)
+    assert deletion_plan.number_of_files == 4
+    assert deletion_plan.total_bytes == sum(file.stat().st_size for file in fixt_dir_with_files.rglob("*.*"))
+    assert deletion_plan.oldest_modified <= deletion_plan.newest_modified
+    assert deletion_plan.directories[fixt_dir_with_files / "src" / "bacore"].number_of_files == 2
+    assert len(list(iter_files_in_dir(directory=fixt_dir_with_files, recursive=True))) == 4
+
+
+def test_plan_file_deletion_nothing_to_delete(fixt_dir_with_files):
+    deletion_plan = plan_file_deletion(path=fixt_dir_with_files, older_than_days=1, recursive=True)
+    assert deletion_plan.number_of_files == 0
+    assert deletion_plan.oldest_modified is None
+
+
+def test_delete_files_throttled(fixt_dir_with_files):
+    deleted_files_response = delete_files(path=fixt_dir_with_files, recursive=True, max_files_per_second=20)
+    assert deleted_files_response.number_of_deleted_files == 4
+    assert deleted_files_response.elapsed_seconds >= 0.15
+    assert deleted_files_response.files_per_second <= 4 / 0.15
+
+
+def test_mirror_files(fixt_dir_with_files, tmp_path_factory):
+    destination = tmp_path_factory.mktemp("mirror")
+    (destination / "old").mkdir()
+    (destination / "old" / "stale.txt").write_text("stale")
+
+    mirrored_files_response = mirror_files(source=fixt_dir_with_files, destination=destination)
+    assert mirrored_files_response.files_copied == 4
+    assert mirrored_files_response.files_deleted == 1
+    assert mirrored_files_response.bytes_transferred == sum(
+        file.stat().st_size for file in fixt_dir_with_files.rglob("*.*")
+    )
+    assert (destination / "src" / "bacore" / "__init__.py").read_text() == '"""BACore main module"""'
+    assert not (destination / "old").exists()
+
+    (fixt_dir_with_files / "readme.md").write_text("Changed")
+    mirrored_files_response = mirror_files(source=fixt_dir_with_files, destination=destination)
+    assert mirrored_files_response.files_copied == 1
+    assert mirrored_files_response.files_skipped == 3
+    assert (destination / "readme.md").read_text() == "Changed"
+
+
+def test_mirror_files_checksum(fixt_dir_with_files, tmp_path_factory):
+    destination = tmp_path_factory.mktemp("mirror")
+    mirror_files(source=fixt_dir_with_files, destination=destination, pattern="*.md")
+    (destination / "readme.md").touch()
+
+    assert mirror_files(source=fixt_dir_with_files, destination=destination, pattern="*.md").files_copied == 1
+    (destination / "readme.md").touch()
+    mirrored_files_response = mirror_files(
+        source=fixt_dir_with_files, destination=destination, pattern="*.md", checksum=True
+    )
+    assert mirrored_files_response.files_copied == 0
+    assert mirrored_files_response.files_skipped == 1
+
+
+def test_mirror_files_copy_file_range_copies_nothing(fixt_dir_with_files, tmp_path_factory, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", lambda *args: 0, raising=False)
+    destination = tmp_path_factory.mktemp("mirror")
+    mirrored_files_response = mirror_files(source=fixt_dir_with_files, destination=destination, pattern="*.md")
+    assert mirrored_files_response.files_copied == 1
+    assert (destination / "readme.md").read_bytes() == (fixt_dir_with_files / "readme.md").read_bytes()
+    assert [file.name for file in destination.iterdir()] == ["readme.md"]
+
+
+def test_rsync_copy_missing_source(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        rsync_copy(source=tmp_path / "missing", destination=tmp_path / "destination", file_filter=None)
+
+
+def test_file_digest(tmp_path):
+    file = tmp_path / "file.bin"
+    file.write_bytes(b"0123456789" * 1000)
+    assert file_digest(file) == file_digest(file, mmap_threshold=1)
+    assert file_digest(file, length=10) == file_digest(file, length=10, mmap_threshold=1)
+    assert file_digest(file, length=10) != file_digest(file)
+
+
+def test_find_duplicate_files(tmp_path):
+    (tmp_path / "screenshots").mkdir()
+    for name in ["a.png", "screenshots/b.png", "screenshots/c.png"]:
+        (tmp_path / name).write_bytes(b"same head" * 100 + b"same tail")
+    (tmp_path / "d.png").write_bytes(b"same head" * 100 + b"diff tail")
+    (tmp_path / "e.txt").write_text("small")
+    (tmp_path / "f.txt").write_text("small")
+    (tmp_path / "unique.txt").write_text("unique")
+
+    duplicate_files_response = find_duplicate_files(directory=tmp_path, head_bytes=64)
+    assert duplicate_files_response.number_of_files == 7
+    assert [group.files for group in duplicate_files_response.duplicate_groups] == [
+        [tmp_path / "a.png", tmp_path / "screenshots" / "b.png", tmp_path / "screenshots" / "c.png"],
+        [tmp_path / "e.txt", tmp_path / "f.txt"],
     ]
+    assert duplicate_files_response.duplicate_groups[0].digest == file_digest(tmp_path / "a.png")
+    assert duplicate_files_response.wasted_bytes == 2 * 909 + 5
@@ -0,0 +1,42 @@
+"""Test data writer tests."""
+
+import csv
+import pytest
+import sqlite3
+from bacore.domain import testdata
+from bacore.interactors.testdata_writer import write_test_data
+
+pytestmark = pytest.mark.interactors
+
+
+@pytest.fixture
+def fixt_batches():
+    test_data = testdata.TestData(country_or_region="sweden")
+    return test_data.iter_batches(25, fields=["first_name", "ssn"], batch_size=10, seed=1)
+
+
+def test_write_test_data_csv(tmp_path, fixt_batches):
+    written = write_test_data(path=tmp_path / "customers.csv", batches=fixt_batches)
+    assert written.number_of_rows == 25
+    with written.path.open(newline="", encoding="utf-8") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows[0] == ["first_name", "ssn"]
+    assert len(rows) == 26
+
+
+def test_write_test_data_sqlite(tmp_path, fixt_batches):
+    written = write_test_data(path=tmp_path / "customers.db", batches=fixt_batches, table="customers")
+    assert written.file_format == "sqlite"
+    with sqlite3.connect(written.path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM customers").fetchone() == (25,)
+
+
+def test_write_test_data_parquet(tmp_path, fixt_batches):
+    pq = pytest.importorskip("pyarrow.parquet")
+    written = write_test_data(path=tmp_path / "customers.parquet", batches=fixt_batches)
+    assert pq.read_table(written.path).num_rows == 25
+
+
+def test_write_test_data_unsupported_format(tmp_path, fixt_batches):
+    with pytest.raises(ValueError):
+        write_test_data(path=tmp_path / "customers.xlsx", batches=fixt_batches)
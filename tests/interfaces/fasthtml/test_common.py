@@ -1,18 +1,22 @@
 """FastHTML web interface tests."""
 
 import httpx
+import re
 import pytest
 from bacore.domain.source_code import DirectoryModel, ModuleModel
 from bacore.interfaces.fasthtml.common import (
     Documentation,
     MarkdownFT,
+    MarkdownRenderer,
+    ModuleMembers,
+    PageCache,
     SrcDirFT,
     flexboxgrid,
     map_uri_to_module,
     uri_to,
 )
 from bacore.web.main import app
-from fasthtml.common import FT
+from fasthtml.common import FT, Div, FastHTML, P, Script, Titled, to_xml
 from pathlib import Path
 from random import choice
 from starlette.testclient import TestClient
@@ -74,6 +78,22 @@ def test_markdown_file():
     assert isinstance(readme_file.__ft__(), FT), readme_file.__ft__()
 
 
+def test_markdown_renderer():
+    pytest.importorskip("markdown_it")
+    renderer = MarkdownRenderer(max_entries=1)
+    assert "<h2>Heading</h2>" in to_xml(renderer("## Heading"))
+    assert renderer.html("## Heading") is renderer.html("## Heading")
+    renderer.html("Other")
+    assert len(renderer) == 1
+
+
+def test_markdown_renderer_client_side():
+    renderer = MarkdownRenderer(server_side=False)
+    assert to_xml(renderer("## Heading", tag=P)) == to_xml(P("## Heading", cls="marked"))
+    with pytest.raises(RuntimeError):
+        renderer.html("## Heading")
+
+
 class TestSrcDirFT:
     src_docs = SrcDirFT(path=Path("python/bacore"), package_root="bacore")
     test_docs = SrcDirFT(path=Path("tests"), package_root="tests")
@@ -107,3 +127,72 @@ class TestDocumentation:
         url = choice(list(self.test_docs.docs_tree().keys()))
         assert isinstance(url, str), url
         assert isinstance(self.test_docs.docs_tree().get(url), ModuleModel), self.test_docs.docs_tree()
+
+    def test_docs_tree_is_cached(self):
+        docs = Documentation(path=Path("python/bacore"), package_root="bacore", poll_interval=None)
+        docs_tree = docs.docs_tree()
+        version = docs.version
+        assert docs.docs_tree() == docs_tree
+        assert docs.version == version
+        assert docs.docs_tree() == map_uri_to_module(directory_model=docs)
+
+    def test_docs_tree_is_read_only(self):
+        docs = Documentation(path=Path("python/bacore"), package_root="bacore", poll_interval=None)
+        with pytest.raises(TypeError):
+            docs.docs_tree()["injected"] = None
+        assert "injected" not in docs.docs_tree()
+
+    def test_docs_tree_follows_changes(self, tmp_path):
+        package = tmp_path / "package"
+        (package / "sub").mkdir(parents=True)
+        (package / "__init__.py").write_text('"""Package."""', encoding="utf-8")
+        (package / "sub" / "first_module.py").write_text('"""First."""', encoding="utf-8")
+        docs = Documentation(path=package, package_root="package", poll_interval=0)
+        assert set(docs.docs_tree()) == {"", "sub/first-module"}
+
+        (package / "sub" / "second_module.py").write_text('"""Second."""', encoding="utf-8")
+        (package / "other").mkdir()
+        (package / "other" / "third_module.py").write_text('"""Third."""', encoding="utf-8")
+        assert set(docs.docs_tree()) == {"", "sub/first-module", "sub/second-module", "other/third-module"}
+
+        (package / "sub" / "first_module.py").unlink()
+        (package / "other" / "third_module.py").unlink()
+        (package / "other").rmdir()
+        assert set(docs.docs_tree()) == {"", "sub/second-module"}
+
+
+def test_page_cache_renders_as_fasthtml():
+    page_app = FastHTML(hdrs=(flexboxgrid,), ftrs=(Script("footer()"),), htmlkw={"lang": "en"})
+    page_cache = PageCache()
+
+    def page():
+        return Titled("Page", Div("Content", cls="row"))
+
+    @page_app.get("/rendered")
+    def rendered():
+        return page()
+
+    @page_app.get("/cached")
+    def cached(request):
+        return page_cache.respond(request, key="/cached", fingerprint=1, page=page)
+
+    def normalized(response):
+        """HTML without the whitespace between tags, which differs with the indentation level."""
+        return re.sub(r">\s+<", "><", response.text.strip())
+
+    page_client = TestClient(page_app)
+    for headers in ({}, {"HX-Request": "true"}):
+        cached_page = normalized(page_client.get("/cached", headers=headers))
+        assert cached_page == normalized(page_client.get("/rendered", headers=headers))
+    assert cached_page.startswith("<title>Page</title>")
+    assert normalized(page_client.get("/cached")).startswith('<!doctype html><html lang="en"><head><title>Page</title>')
+    assert len(page_cache) == 2
+
+
+def test_module_members():
+    module = ModuleModel(path=Path("python/bacore/domain/source_code.py"), package_root="bacore")
+    members = ModuleMembers.of(module)
+    assert members.doc == module.doc
+    class_members = members.classes[0]
+    assert class_members.klass.name == "ClassModel"
+    assert class_members.functions == class_members.klass.functions()
@@ -1,40 +1,304 @@
-# """Test cases for Power Point interface."""
-
-# import pytest
-# from bacore.interfaces.power_point import SPresentation, SSlide
-# from pathlib import Path
-# from sqlmodel import Session, SQLModel, create_engine
-
-# sqlite_file_path = "data/database.db"
-# sqlite_url = f"sqlite:///{sqlite_file_path}"
-
-# engine = create_engine(sqlite_url, echo=True)
-
-
-# def create_presentation_data():
-#     with Session(engine) as session:
-#         bacore_main_content = SSlide(title="Main Content")
-#         session.add(bacore_main_content)
-
-#         bacore_presentation = SPresentation(
-#             name="BACore Presentation",
-#             slides=[SSlide(title="Introduction"), bacore_main_content],
-#         )
-#         session.add(bacore_presentation)
-#         session.commit()
-#         session.refresh(bacore_main_content)
-#         session.refresh(bacore_presentation)
-#         return bacore_presentation
-
-
-# @pytest.mark.skip
-# def test_spresentation():
-#     if Path(sqlite_file_path).exists():
-#         Path(sqlite_file_path).unlink()
-#     assert not Path(sqlite_file_path).exists(), "The presentation file was not reset."
-
-#     SQLModel.metadata.create_all(engine)
-#     bacore_presentation = create_presentation_data()
-#     assert bacore_presentation.id == 1
-#     assert bacore_presentation.name == "BACore Presentation"
-#     assert bacore_presentation.slides == SSlide()
+"""Test cases for Power Point interface."""
+
+import pytest
+from bacore.interfaces.power_point import (
+    ImageAssetCache,
+    PresentationLoader,
+    PresentationTemplate,
+    SImage,
+    SPresentation,
+    SSlide,
+    SText,
+    STextFrame,
+    build_presentations,
+    image_assets,
+)
+from io import BytesIO
+from PIL import Image
+from pptx import Presentation
+from pptx.parts import image as pptx_image
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.util import Inches
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+from zipfile import ZipFile
+
+pytestmark = pytest.mark.interfaces
+
+
+@pytest.fixture
+def fixt_presentation_database(tmp_path):
+    """Database with two presentations, where the second has a slide layout which does not exist."""
+    database_url = f"sqlite:///{tmp_path / 'presentations.db'}"
+    engine = create_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            SPresentation(
+                name="Customer Deck",
+                slides=[
+                    SSlide(layout_index=0, title="Introduction", sub_title="For the customer"),
+                    SSlide(
+                        layout_index=5,
+                        title="Main Content",
+                        textframes=[
+                            STextFrame(offset_left=1, offset_top=2, width=4, height=2, texts=[SText(content="Text")])
+                        ],
+                    ),
+                ],
+            )
+        )
+        session.add(SPresentation(name="Broken Deck", slides=[SSlide(layout_index=99)]))
+        session.commit()
+    engine.dispose()
+    return database_url
+
+
+def test_build_presentations(fixt_presentation_database, tmp_path):
+    batch = build_presentations(
+        database_url=fixt_presentation_database,
+        presentations=select(SPresentation.id).order_by(SPresentation.id),
+        output_dir=tmp_path / "decks",
+        max_workers=2,
+    )
+    assert batch.number_of_built == 1
+    assert batch.number_of_failed == 1
+    customer_deck, broken_deck = batch.presentations
+    assert customer_deck.path == tmp_path / "decks" / "customer_deck.pptx"
+    assert len(Presentation(str(customer_deck.path)).slides) == 2
+    assert broken_deck.error == "ValueError: Layout index '99' out of range."
+    assert list((tmp_path / "decks").iterdir()) == [customer_deck.path]
+
+
+def test_build_presentations_with_same_file_name(fixt_presentation_database, tmp_path):
+    engine = create_engine(fixt_presentation_database)
+    with Session(engine) as session:
+        session.add(SPresentation(name="customer-deck", slides=[SSlide(layout_index=0)]))
+        session.commit()
+    engine.dispose()
+
+    with pytest.raises(ValueError, match="customer_deck.pptx"):
+        build_presentations(database_url=fixt_presentation_database, presentations=[1, 3], output_dir=tmp_path)
+    with pytest.raises(ValueError):
+        build_presentations(database_url=fixt_presentation_database, presentations=[1, 1], output_dir=tmp_path)
+
+    batch = build_presentations(
+        database_url=fixt_presentation_database, presentations=[3], output_dir=tmp_path, max_workers=1
+    )
+    assert batch.number_of_built == 1
+
+
+def test_presentation_loader(fixt_presentation_database, tmp_path):
+    engine = create_engine(fixt_presentation_database)
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    with Session(engine) as session:
+        loader = PresentationLoader(session=session, cache=True)
+        customer_deck, broken_deck = loader.load_many([1, 2])
+        number_of_queries = len(queries)
+        assert number_of_queries == 5
+        assert [text.content for text in customer_deck.slides[1].textframes[0].texts] == ["Text"]
+        assert len(queries) == number_of_queries
+        assert loader.load(1) is customer_deck
+        assert len(queries) == number_of_queries
+        with pytest.raises(LookupError):
+            loader.load(3)
+
+    with Session(engine) as session:
+        customer_deck = session.get(SPresentation, 1)
+        queries.clear()
+        customer_deck.create(output_dir=tmp_path)
+        assert len(queries) == 5
+
+    with Session(engine) as session:
+        customer_deck = session.get(SPresentation, 1)
+        assert len(customer_deck.slides) == 2
+        queries.clear()
+        customer_deck.create(output_dir=tmp_path)
+        assert len(queries) == 5
+        queries.clear()
+        customer_deck.create(output_dir=tmp_path)
+        assert queries == []
+    engine.dispose()
+
+
+def test_image_asset_cache(tmp_path):
+    image_file = tmp_path / "logo.png"
+    Image.new("RGB", (2000, 1000), color=(200, 30, 30)).save(image_file)
+    assets = ImageAssetCache(max_dpi=100)
+
+    asset = assets.get(image_file, width=Inches(2))
+    assert assets.get(image_file, width=Inches(2)) is asset
+    with Image.open(asset.buffer()) as scaled_image:
+        assert scaled_image.size == (200, 100)
+    assert ImageAssetCache().get(image_file).blob == image_file.read_bytes()
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    SImage(path=str(image_file), width=2).add_to_slide(slide=slide, assets=assets)
+    SImage(path=str(image_file), width=2, offset_left=3).add_to_slide(slide=slide, assets=assets)
+    assert len(assets) == 1
+    assert len({picture.image.sha1 for picture in slide.shapes}) == 1
+    assert [picture.width for picture in slide.shapes] == [Inches(2), Inches(2)]
+    assert [picture.height for picture in slide.shapes] == [Inches(1), Inches(1)]
+
+
+def test_image_asset_cache_reuses_image_parts(tmp_path, monkeypatch):
+    image_file = tmp_path / "logo.png"
+    Image.new("RGB", (200, 100), color=(200, 30, 30)).save(image_file)
+    assets = ImageAssetCache()
+    prs = Presentation()
+    first_slide = prs.slides.add_slide(prs.slide_layouts[6])
+    first_picture = assets.add_picture(first_slide, image_file, width=Inches(2))
+
+    def parse_image(*args, **kwargs):
+        raise AssertionError("The image was parsed again.")
+
+    monkeypatch.setattr(pptx_image.Image, "from_blob", parse_image)
+    monkeypatch.setattr(pptx_image.ImagePart, "sha1", property(parse_image))
+    second_slide = prs.slides.add_slide(prs.slide_layouts[6])
+    second_picture = assets.add_picture(second_slide, image_file, left=Inches(1), height=Inches(2))
+    assert second_picture._pic.blipFill.blip.rEmbed in second_slide.part.rels
+    assert (second_picture.width, second_picture.height) == (Inches(4), Inches(2))
+    monkeypatch.undo()
+
+    buffer = BytesIO()
+    prs.save(buffer)
+    assert len([name for name in ZipFile(buffer).namelist() if name.startswith("ppt/media/")]) == 1
+    assert first_picture.width == Inches(2)
+
+
+@pytest.fixture
+def fixt_presentation_template(tmp_path):
+    """Template with a branded title slide, with a logo, and a content slide with a hyperlink."""
+    image_file = tmp_path / "logo.png"
+    Image.new("RGB", (200, 100), color=(200, 30, 30)).save(image_file)
+    prs = Presentation()
+    prs.slide_width = Inches(13.33)
+    title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+    title_slide.shapes.title.text = "Brand"
+    title_slide.shapes.add_picture(str(image_file), left=Inches(11), top=Inches(6), width=Inches(1))
+    content_slide = prs.slides.add_slide(prs.slide_layouts[5])
+    link_box = content_slide.shapes.add_textbox(left=0, top=0, width=Inches(2), height=Inches(1))
+    link_box.name = "Link"
+    run = link_box.text_frame.paragraphs[0].add_run()
+    run.text = "BACore"
+    run.hyperlink.address = "https://example.com"
+    template_file = tmp_path / "template.pptx"
+    prs.save(str(template_file))
+    return template_file
+
+
+def test_presentation_template(fixt_presentation_template, tmp_path):
+    template = PresentationTemplate.load(fixt_presentation_template)
+    assert PresentationTemplate.load(fixt_presentation_template) is template
+    assert len(template.slides) == 2
+
+    presentation = SPresentation(
+        name="Template Deck",
+        slides=[
+            SSlide(id=1, layout_index=0, title="Quarterly Review", sub_title="For the customer"),
+            SSlide(id=2, layout_index=6),
+            SSlide(id=3, layout_index=6),
+        ],
+    )
+    prs = presentation.create(output_dir=tmp_path, template=template, template_slides={1: 0, 2: 1})
+    assert prs.slide_width == Inches(13.33)
+
+    saved = Presentation(str(tmp_path / "template_deck.pptx"))
+    title_slide, content_slide, blank_slide = saved.slides
+    assert title_slide.shapes.title.text == "Quarterly Review"
+    assert title_slide.placeholders[1].text == "For the customer"
+    picture = [shape for shape in title_slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE][0]
+    assert picture.image.blob == (tmp_path / "logo.png").read_bytes()
+    link_run = [shape for shape in content_slide.shapes if shape.name == "Link"][0].text_frame.paragraphs[0].runs[0]
+    assert link_run.hyperlink.address == "https://example.com"
+    assert len(blank_slide.shapes) == 0
+
+    template.fill(content_slide, {"Link": "Changed"})
+    assert [shape for shape in content_slide.shapes if shape.name == "Link"][0].text == "Changed"
+    with pytest.raises(KeyError):
+        template.fill(content_slide, {7: "Missing"})
+    with pytest.raises(ValueError):
+        template.clone_slide(template.new_presentation(), 2)
+
+
+def test_presentation_template_with_unsupported_relationship(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(left=0, top=0, width=Inches(2), height=Inches(1))
+    layout_rId = slide.part.relate_to(slide.slide_layout.part, RT.SLIDE_LAYOUT)
+    box._element.nvSpPr.cNvPr.set(qn("r:dm"), layout_rId)
+    template_file = tmp_path / "smart_art_template.pptx"
+    prs.save(str(template_file))
+
+    template = PresentationTemplate.load(template_file)
+    assert template.slides[0].unsupported == (RT.SLIDE_LAYOUT,)
+    with pytest.raises(ValueError, match="can not be cloned"):
+        template.clone_slide(template.new_presentation(), 0)
+
+
+def test_presentation_create_incremental(tmp_path, monkeypatch):
+    image_file = tmp_path / "logo.png"
+    Image.new("RGB", (200, 100), color=(200, 30, 30)).save(image_file)
+    presentation = SPresentation(
+        name="Weekly Deck",
+        slides=[
+            SSlide(layout_index=0, title="Week 1", images=[SImage(path=str(image_file), width=1)]),
+            SSlide(
+                layout_index=5,
+                title="Numbers",
+                textframes=[STextFrame(width=4, height=2, texts=[SText(content="Text", url="https://example.com")])],
+            ),
+            SSlide(layout_index=5, title="Outlook"),
+        ],
+    )
+    rendered = []
+    create_slide = SSlide.create
+    monkeypatch.setattr(
+        SSlide, "create", lambda slide, **kwargs: rendered.append(slide.title) or create_slide(slide, **kwargs)
+    )
+
+    presentation.create(output_dir=tmp_path, incremental=True)
+    assert rendered == ["Week 1", "Numbers", "Outlook"]
+    assert SPresentation.manifest_path(tmp_path / "weekly_deck.pptx").is_file()
+
+    rendered.clear()
+    presentation.slides[2].title = "Next Week"
+    presentation.create(output_dir=tmp_path, incremental=True)
+    assert rendered == ["Next Week"]
+    saved = Presentation(str(tmp_path / "weekly_deck.pptx"))
+    assert [slide.shapes.title.text for slide in saved.slides] == ["Week 1", "Numbers", "Next Week"]
+    assert [shape.shape_type for shape in saved.slides[0].shapes].count(MSO_SHAPE_TYPE.PICTURE) == 1
+    link_box = [shape for shape in saved.slides[1].shapes if not shape.is_placeholder][0]
+    assert link_box.text_frame.paragraphs[1].runs[0].hyperlink.address == "https://example.com"
+
+    rendered.clear()
+    presentation.create(output_dir=tmp_path, width=Inches(10), height=Inches(7.5), incremental=True)
+    assert len(rendered) == 3
+
+    rendered.clear()
+    presentation.slides[0].id = 1
+    presentation.create(
+        output_dir=tmp_path, width=Inches(10), height=Inches(7.5), template_slides={1: 0}, incremental=True
+    )
+    assert rendered == ["Week 1"]
+
+    rendered.clear()
+    monkeypatch.setattr(image_assets, "max_dpi", 96)
+    presentation.create(
+        output_dir=tmp_path, width=Inches(10), height=Inches(7.5), template_slides={1: 0}, incremental=True
+    )
+    assert len(rendered) == 3
+
+    def clone_slide(template, prs, index):
+        raise ValueError("Template slide refers to content which can not be cloned")
+
+    rendered.clear()
+    monkeypatch.setattr(PresentationTemplate, "clone_slide", clone_slide)
+    presentation.create(
+        output_dir=tmp_path, width=Inches(10), height=Inches(7.5), template_slides={1: 0}, incremental=True
+    )
+    assert len(rendered) == 3
@@ -0,0 +1,67 @@
+"""Test cases for the static site export of BACore documentation."""
+
+import json
+import pytest
+import sys
+from bacore import cli
+from bacore.web.export import MANIFEST_FILE_NAME, export_site, page_file, render_html
+from fasthtml.common import Meta, P, Title
+from pathlib import Path
+
+
+def test_page_file():
+    assert page_file(Path("site"), "/") == Path("site/index.html")
+    assert page_file(Path("site"), "/docs/") == Path("site/docs/index.html")
+    assert page_file(Path("site"), "/docs/domain/files") == Path("site/docs/domain/files/index.html")
+
+
+def test_render_html():
+    html = render_html((Title("Page"), Meta(name="description", content="Docs"), P("Text")))
+    head, body = html.split("</head>")
+    assert head.startswith("<!doctype html>")
+    assert "<title>Page</title>" in head and 'name="description"' in head
+    assert "<p>Text</p>" in body and "description" not in body
+
+
+def test_export_site(tmp_path):
+    exported_site = export_site(output_dir=tmp_path, max_workers=1)
+    assert "/" in exported_site.pages_written
+    assert "/docs/domain/files" in exported_site.pages_written
+    assert (tmp_path / MANIFEST_FILE_NAME).is_file()
+
+    docs_page = (tmp_path / "docs" / "domain" / "files" / "index.html").read_text(encoding="utf-8")
+    assert docs_page.startswith("<!doctype html>")
+    assert "Module domain files for handling of files and directories." in docs_page
+
+
+def test_export_site_is_incremental(tmp_path):
+    export_site(output_dir=tmp_path, max_workers=1)
+    (tmp_path / "docs" / "domain" / "files" / "index.html").unlink()
+
+    exported_site = export_site(output_dir=tmp_path, max_workers=1)
+    assert exported_site.pages_written == ["/docs/domain/files"]
+    assert exported_site.pages_unchanged > 0
+
+
+def test_export_site_prunes_removed_pages(tmp_path):
+    export_site(output_dir=tmp_path, max_workers=1)
+    manifest_file = tmp_path / MANIFEST_FILE_NAME
+    manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    manifest["pages"]["/docs/removed/package/module"] = [0, 0]
+    manifest_file.write_text(json.dumps(manifest), encoding="utf-8")
+    removed_file = page_file(tmp_path, "/docs/removed/package/module")
+    removed_file.parent.mkdir(parents=True)
+    removed_file.write_text("Removed", encoding="utf-8")
+
+    exported_site = export_site(output_dir=tmp_path, max_workers=1)
+    assert exported_site.pages_removed == ["/docs/removed/package/module"]
+    assert not (tmp_path / "docs" / "removed").exists()
+    assert (tmp_path / "docs" / "domain" / "files" / "index.html").is_file()
+
+
+def test_cli_without_web_extra(monkeypatch, capsys, tmp_path):
+    monkeypatch.setitem(sys.modules, "bacore.web.export", None)
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["export", "documentation", str(tmp_path)])
+    assert exit_info.value.code == 1
+    assert "pip install 'bacore[web]'" in capsys.readouterr().err
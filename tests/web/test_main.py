@@ -57,3 +57,17 @@ def test_tests_slash():
     """
     with pytest.raises(ValueError):
         client.get("/tests/")
+
+
+def test_docs_etag():
+    response = client.get("/docs/domain/files")
+    etag = response.headers.get("etag")
+    assert response.status_code == 200 and etag, f"\nHeaders: {response.headers}"
+    assert client.get("/docs/domain/files").text == response.text
+
+    not_modified_response = client.get("/docs/domain/files", headers={"If-None-Match": etag})
+    assert not_modified_response.status_code == 304, not_modified_response.headers
+    assert not_modified_response.headers.get("etag") == etag
+
+    modified_response = client.get("/docs/domain/files", headers={"If-None-Match": '"outdated"'})
+    assert modified_response.status_code == 200, modified_response.headers